@@ -1,24 +1,25 @@
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QObject, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal
 from src.history_service import HistoryService
+from src.paste_backends import KeyboardPasteBackend
 from src.paste_service import PasteService
 
 class ClipboardManager(QObject):
-    history_updated = pyqtSignal(list)
-    pinned_history_updated = pyqtSignal(list)
-    images_updated = pyqtSignal(list)
+    history_changed = pyqtSignal(list)
+    pinned_history_changed = pyqtSignal(list)
+    images_changed = pyqtSignal(list)
 
-    def __init__(self, settings_manager):
+    def __init__(self, settings_manager, clipboard, paste_backend=None):
         super().__init__()
         self.settings = settings_manager
-        self.clipboard = QApplication.clipboard()
+        self.clipboard = clipboard
 
         self.history_service = HistoryService(settings_manager)
-        self.paste_service = PasteService()
+        self.paste_service = PasteService(settings_manager,
+                                          paste_backend or KeyboardPasteBackend(clipboard))
 
-        self.history_service.history_updated.connect(self.history_updated)
-        self.history_service.pinned_history_updated.connect(self.pinned_history_updated)
-        self.history_service.images_updated.connect(self.images_updated)
+        self.history_service.history_changed.connect(self.history_changed)
+        self.history_service.pinned_history_changed.connect(self.pinned_history_changed)
+        self.history_service.images_changed.connect(self.images_changed)
 
         self._block_clipboard_change = False
         self.clipboard.dataChanged.connect(self.on_clipboard_change)
@@ -26,7 +27,6 @@ class ClipboardManager(QObject):
         settings_manager.settings_changed.connect(self.on_settings_change)
 
         self.last_text = ''
-        self.last_image_hash = ''
 
     def on_clipboard_change(self):
         if self._block_clipboard_change:
@@ -35,23 +35,19 @@ class ClipboardManager(QObject):
         try:
             self._block_clipboard_change = True
 
-            pixmap = self.clipboard.pixmap()
-            if not pixmap.isNull():
-                current_image_hash = self.get_image_hash(pixmap)
+            if self.paste_service.is_own_change(self.clipboard.mimeData()):
+                return
 
-                if current_image_hash != self.last_image_hash:
-                    self.last_image_hash = current_image_hash
-                    self.last_text = ''
-                    self.history_service.add_image(pixmap)
-                    return
-                else:
-                    return
+            image = self.clipboard.image()
+            if not image.isNull():
+                self.last_text = ''
+                self.history_service.add_image(image)
+                return
 
             text = self.clipboard.text().strip()
             if text:
                 if text != self.last_text:
                     self.last_text = text
-                    self.last_image_hash = ''
                     self.history_service.add_to_history(text)
                 else:
                     return
@@ -61,38 +57,13 @@ class ClipboardManager(QObject):
         finally:
             self._block_clipboard_change = False
 
-    def get_image_hash(self, pixmap):
-        try:
-            image = pixmap.toImage()
-            if image.isNull():
-                return 'null_image'
-
-            size = f'{image.width()}x{image.height()}'
-
-            byte_array = QByteArray()
-            buffer = QBuffer(byte_array)
-            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
-
-            success = pixmap.save(buffer, "PNG")
-            if not success:
-                return f'{size}_save_failed'
-
-            buffer.close()
-
-            data = byte_array.data()
-            sample_size = min(1000, len(data))
-            sample_data = data[:sample_size] if data else b''
-
-            return f'{size}_{hash(sample_data) % 100000}'
-
-        except Exception:
-            return 'error_hash'
-
     def on_settings_change(self, key, value):
         if key == 'max_history_size':
             self.history_service.update_max_size(value)
-        elif key == 'max_images_size':
-            self.history_service.update_max_images_size(value)
+        elif key == 'max_images_bytes':
+            self.history_service.update_images_budget(value)
+        elif key == 'search_mode':
+            self.history_service.set_search_mode(value)
 
     def pin_current_item(self):
         self.history_service.pin_current_item()
@@ -100,22 +71,36 @@ class ClipboardManager(QObject):
     def pin_selected_text(self, text):
         self.history_service.pin_text(text)
 
+    def remove_from_history(self, text):
+        self.history_service.remove_from_history(text)
+
     def remove_from_pinned(self, text):
         self.history_service.remove_pinned(text)
 
     def paste_to_active_app(self, text):
         self.paste_service.paste_text(text)
 
-    def on_filter_text_changed(self, filter_text):
-        self.history_service.filter_items(filter_text)
+    def paste_many_to_active_app(self, texts):
+        self.paste_service.paste_texts(texts)
+
+    def paste_history_slot(self, slot, pressed_at=None):
+        self.paste_service.quick_paste_text(self.history_service.get_history_item(slot - 1),
+                                            pressed_at)
+
+    def paste_pinned_slot(self, slot, pressed_at=None):
+        self.paste_service.quick_paste_text(self.history_service.get_pinned_item(slot - 1),
+                                            pressed_at)
+
+    def on_filter_text_changed(self, filter_text, mode=None):
+        self.history_service.filter_items(filter_text, mode)
 
-    def paste_image_to_active_app(self, image_base64):
-        pixmap = self.history_service.get_image_pixmap(image_base64)
-        if not pixmap.isNull():
-            self.paste_service.paste_image(pixmap)
+    def paste_image_to_active_app(self, image_id):
+        image = self.history_service.get_image(image_id)
+        if not image.isNull():
+            self.paste_service.paste_image(image)
 
-    def remove_image(self, image_base64):
-        self.history_service.remove_image(image_base64)
+    def remove_image(self, image_id):
+        self.history_service.remove_image(image_id)
 
     def clear_images(self):
         self.history_service.clear_images()
\ No newline at end of file
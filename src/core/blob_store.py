@@ -0,0 +1,57 @@
+import hashlib, os, struct, tempfile
+
+
+class BlobStore:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def contains(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, data, digest=None):
+        digest = digest or self.digest(data)
+        path = self.path(digest)
+        if os.path.exists(path):
+            return digest
+
+        fd, temp_path = tempfile.mkstemp(prefix='.blob_', suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return digest
+
+    def get(self, digest):
+        try:
+            with open(self.path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def remove(self, digest):
+        try:
+            os.remove(self.path(digest))
+        except OSError:
+            pass
+
+    @staticmethod
+    def digest(data):
+        return hashlib.sha256(data).hexdigest()
+
+
+def png_dimensions(data):
+    if len(data) < 24 or data[:8] != b'\x89PNG\r\n\x1a\n' or data[12:16] != b'IHDR':
+        return 0, 0
+    return struct.unpack('>II', data[16:24])
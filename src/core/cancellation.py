@@ -0,0 +1,10 @@
+CANCEL_CHECK_INTERVAL = 1024
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+def check_cancelled(counter, is_cancelled):
+    if is_cancelled is not None and counter % CANCEL_CHECK_INTERVAL == 0 and is_cancelled():
+        raise SearchCancelled()
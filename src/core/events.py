@@ -0,0 +1,15 @@
+class EventEmitter:
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        if handler not in self.handlers:
+            self.handlers.append(handler)
+
+    def disconnect(self, handler):
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+
+    def emit(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
@@ -0,0 +1,74 @@
+import heapq
+from src.core.cancellation import check_cancelled
+
+SCAN_LIMIT = 512
+MATCH_SCORE = 1.0
+STREAK_BONUS = 4.0
+BOUNDARY_BONUS = 6.0
+START_BONUS = 8.0
+GAP_PENALTY = 0.05
+MAX_GAP_PENALTY = 5.0
+RECENCY_BONUS = 10.0
+
+
+def fuzzy_score(text, query):
+    text = text[:SCAN_LIMIT]
+    lower = text.lower()
+    if len(lower) != len(text):
+        text = lower
+
+    score = 0.0
+    previous = -1
+    for char in query:
+        position = lower.find(char, previous + 1)
+        if position < 0:
+            return None
+
+        score += MATCH_SCORE
+        if position == previous + 1 and previous >= 0:
+            score += STREAK_BONUS
+        elif previous >= 0:
+            score -= min(MAX_GAP_PENALTY, (position - previous - 1) * GAP_PENALTY)
+
+        if position == 0:
+            score += START_BONUS
+        elif not text[position - 1].isalnum() or (
+                text[position].isupper() and text[position - 1].islower()):
+            score += BOUNDARY_BONUS
+
+        previous = position
+
+    return score
+
+
+class FuzzyMatcher:
+    def __init__(self, limit=200):
+        self.limit = limit
+        self._cache = (None, None, None)
+
+    def search(self, entries, query, version=None, is_cancelled=None):
+        query = query.replace(' ', '')
+        if not query:
+            return list(entries)
+
+        cached_version, cached_query, cached_matches = self._cache
+        if (cached_query and version is not None and cached_version == version
+                and query.startswith(cached_query)):
+            pool = cached_matches
+        else:
+            pool = enumerate(entries)
+
+        total = max(len(entries), 1)
+        matches = []
+        scored = []
+        for counter, (rank, text) in enumerate(pool):
+            check_cancelled(counter, is_cancelled)
+            score = fuzzy_score(text, query)
+            if score is None:
+                continue
+            matches.append((rank, text))
+            scored.append((score + RECENCY_BONUS * (1 - rank / total), -rank, text))
+
+        self._cache = (version, query, matches)
+
+        return [text for score, rank, text in heapq.nlargest(self.limit, scored)]
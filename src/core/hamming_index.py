@@ -0,0 +1,66 @@
+from collections import defaultdict
+
+HASH_BITS = 64
+
+
+def hamming_distance(left, right):
+    return bin(left ^ right).count('1')
+
+
+class HammingIndex:
+    def __init__(self, bands=4, bits=HASH_BITS):
+        self.bands = bands
+        self.band_bits = bits // bands
+        self._mask = (1 << self.band_bits) - 1
+        self._hashes = {}
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, key, phash):
+        if phash is None:
+            return
+        self.remove(key)
+        value = int(phash, 16)
+        self._hashes[key] = value
+        for band, band_value in enumerate(self._band_values(value)):
+            self._buckets[band][band_value].add(key)
+
+    def remove(self, key):
+        value = self._hashes.pop(key, None)
+        if value is None:
+            return
+        for band, band_value in enumerate(self._band_values(value)):
+            bucket = self._buckets[band][band_value]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band][band_value]
+
+    def clear(self):
+        self._hashes.clear()
+        for buckets in self._buckets:
+            buckets.clear()
+
+    def nearest(self, phash, threshold):
+        if phash is None or threshold < 0:
+            return None
+        value = int(phash, 16)
+
+        if threshold < self.bands:
+            candidates = set()
+            for band, band_value in enumerate(self._band_values(value)):
+                candidates.update(self._buckets[band].get(band_value, ()))
+        else:
+            candidates = self._hashes.keys()
+
+        best = None
+        for key in candidates:
+            distance = hamming_distance(value, self._hashes[key])
+            if distance <= threshold and (best is None or distance < best[1]):
+                best = (key, distance)
+        return best
+
+    def _band_values(self, value):
+        for band in range(self.bands):
+            yield (value >> (band * self.band_bits)) & self._mask
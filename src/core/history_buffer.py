@@ -0,0 +1,107 @@
+import itertools, time
+from collections import OrderedDict
+
+_entry_ids = itertools.count(1)
+
+
+class HistoryBuffer:
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._texts = {}
+        self._ranks = {}
+        self._newest_rank = 0
+        self._oldest_rank = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, text):
+        return text in self._entries
+
+    def __iter__(self):
+        return reversed(self._entries)
+
+    def items(self):
+        for text, (entry_id, created_at) in reversed(self._entries.items()):
+            yield text, created_at
+
+    def entries(self):
+        for text, (entry_id, created_at) in reversed(self._entries.items()):
+            yield entry_id, text
+
+    def to_list(self):
+        return list(reversed(self._entries))
+
+    def newest(self):
+        if not self._entries:
+            return None
+        return next(reversed(self._entries))
+
+    def entry_id(self, text):
+        value = self._entries.get(text)
+        return value[0] if value else None
+
+    def text(self, entry_id):
+        return self._texts.get(entry_id)
+
+    def created_at(self, text):
+        value = self._entries.get(text)
+        return value[1] if value else None
+
+    def rank(self, text):
+        return self._ranks.get(text, self._oldest_rank)
+
+    def add(self, text, created_at=None):
+        current = self._entries.get(text)
+        entry_id = current[0] if current else next(_entry_ids)
+        self._entries[text] = (entry_id, created_at or time.time())
+        self._texts[entry_id] = text
+        self._newest_rank += 1
+        self._ranks[text] = self._newest_rank
+        if current:
+            self._entries.move_to_end(text)
+        return bool(current), self._evict()
+
+    def append_older(self, text, created_at=None):
+        if text in self._entries:
+            return None
+        if self.max_size is not None and len(self._entries) >= self.max_size:
+            return None
+        entry_id = next(_entry_ids)
+        self._entries[text] = (entry_id, created_at or time.time())
+        self._texts[entry_id] = text
+        self._oldest_rank -= 1
+        self._ranks[text] = self._oldest_rank
+        self._entries.move_to_end(text, last=False)
+        return entry_id
+
+    def remove(self, text):
+        value = self._entries.pop(text, None)
+        if value is None:
+            return None
+        del self._texts[value[0]]
+        del self._ranks[text]
+        return value[0]
+
+    def clear(self):
+        self._entries.clear()
+        self._texts.clear()
+        self._ranks.clear()
+
+    def resize(self, max_size):
+        self.max_size = max_size
+        return self._evict()
+
+    def _evict(self):
+        evicted = []
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                text, (entry_id, created_at) = self._entries.popitem(last=False)
+                del self._texts[entry_id]
+                del self._ranks[text]
+                evicted.append((entry_id, text))
+        return evicted
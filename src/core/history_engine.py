@@ -0,0 +1,300 @@
+import functools, itertools, threading
+from src.core.cancellation import check_cancelled
+from src.core.events import EventEmitter
+from src.core.fuzzy_search import FuzzyMatcher
+from src.core.history_buffer import HistoryBuffer
+from src.core.history_events import HistoryView
+from src.core.history_journal import HistoryJournal
+from src.core.query_parser import parse_query
+from src.core.regex_worker import RegexError
+from src.core.trigram_index import TrigramIndex
+
+
+class HistoryEngine:
+    def __init__(self, settings):
+        self.settings = settings
+        self.max_size = settings.get('max_history_size')
+
+        self.journal = HistoryJournal(settings.journal_file, settings.store)
+        self.full_history = HistoryBuffer(self.max_size)
+        self.full_pinned_history = HistoryBuffer()
+        self.history_view = HistoryView()
+        self.pinned_view = HistoryView()
+        self.current_filter = ''
+        self.history_index = None
+        self.pinned_index = None
+        self.search_mode = settings.get('search_mode', 'substring')
+        self.history_matcher = FuzzyMatcher()
+        self.pinned_matcher = FuzzyMatcher()
+        self.history_version = 0
+        self.pinned_version = 0
+        self.lock = threading.Lock()
+
+        self.history_changed = EventEmitter()
+        self.pinned_history_changed = EventEmitter()
+        self.search_requested = EventEmitter()
+        self.search_failed = EventEmitter()
+        self.clip_added = EventEmitter()
+
+    def load(self):
+        history, pinned = self.journal.load(self.max_size)
+        self.append_loaded_pinned(list(pinned.items()))
+        self.append_loaded_history(list(history.items()))
+        self.set_indexes(TrigramIndex(history), TrigramIndex(pinned))
+
+    def append_loaded_history(self, chunk):
+        with self.lock:
+            entries = self._append_loaded(self.full_history, chunk)
+        self.history_version += 1
+        if not self.current_filter:
+            self.history_changed.emit([self.history_view.append(entries)])
+
+    def append_loaded_pinned(self, chunk):
+        with self.lock:
+            entries = self._append_loaded(self.full_pinned_history, chunk)
+        self.pinned_version += 1
+        if not self.current_filter:
+            self.pinned_history_changed.emit([self.pinned_view.append(entries)])
+
+    @staticmethod
+    def _append_loaded(buffer, chunk):
+        entries = []
+        for text, created_at in chunk:
+            entry_id = buffer.append_older(text, created_at)
+            if entry_id is not None:
+                entries.append((entry_id, text))
+        return entries
+
+    def set_indexes(self, history_index, pinned_index):
+        with self.lock:
+            self.history_index = history_index
+            self.pinned_index = pinned_index
+
+    def add_to_history(self, text):
+        if text and text != self.full_history.newest():
+            with self.lock:
+                moved, evicted = self.full_history.add(text)
+                if not moved:
+                    self.history_index.add(text)
+                for entry_id, evicted_text in evicted:
+                    self.history_index.remove(evicted_text)
+
+            changes = [self.history_view.move_to_front((self.full_history.entry_id(text), text))]
+            changes.extend(self.history_view.remove(entry_id) for entry_id, _ in evicted)
+            self._update_history(changes)
+            self._record('add', text)
+            self.clip_added.emit(self.full_history.entry_id(text), text)
+
+    def remove_from_history(self, text):
+        with self.lock:
+            entry_id = self.full_history.remove(text) if text else None
+            if entry_id is not None:
+                self.history_index.remove(text)
+        if entry_id is not None:
+            self._update_history([self.history_view.remove(entry_id)], refilter=False)
+            self._record('delete', text)
+
+    def pin_current_item(self):
+        item_to_pin = self.full_history.newest()
+        if item_to_pin:
+            self.pin_text(item_to_pin)
+
+    def pin_text(self, text):
+        if text and text not in self.full_pinned_history:
+            with self.lock:
+                self.full_pinned_history.add(text)
+                self.pinned_index.add(text)
+            entry = (self.full_pinned_history.entry_id(text), text)
+            self._update_pinned_history([self.pinned_view.move_to_front(entry)])
+            self._record('pin', text, 'pinned')
+
+    def remove_pinned(self, text):
+        with self.lock:
+            entry_id = self.full_pinned_history.remove(text) if text else None
+            if entry_id is not None:
+                self.pinned_index.remove(text)
+        if entry_id is not None:
+            self._update_pinned_history([self.pinned_view.remove(entry_id)], refilter=False)
+            self._record('unpin', text, 'pinned')
+
+    def update_max_size(self, new_size):
+        self.max_size = new_size
+        with self.lock:
+            evicted = self.full_history.resize(new_size)
+            for entry_id, evicted_text in evicted:
+                self.history_index.remove(evicted_text)
+        if evicted:
+            changes = [self.history_view.remove(entry_id) for entry_id, _ in evicted]
+            self._update_history(changes, refilter=False)
+            self.journal.compact(self.full_history, self.full_pinned_history)
+
+    def clear_history(self):
+        with self.lock:
+            self.full_history.clear()
+            self.history_index.clear()
+        self._update_history([self.history_view.reset([])], refilter=False)
+        self._record('clear')
+
+    def clear_pinned_history(self):
+        with self.lock:
+            self.full_pinned_history.clear()
+            self.pinned_index.clear()
+        self._update_pinned_history([self.pinned_view.reset([])], refilter=False)
+        self._record('clear', target='pinned')
+
+    def get_history_item(self, index):
+        return next(itertools.islice(self.full_history, index, None), None)
+
+    def get_pinned_item(self, index):
+        return next(itertools.islice(self.full_pinned_history, index, None), None)
+
+    def get_entry(self, entry_id):
+        for target, buffer in (('history', self.full_history),
+                               ('pinned', self.full_pinned_history)):
+            text = buffer.text(entry_id)
+            if text is not None:
+                return target, text, buffer.created_at(text)
+        return None
+
+    def set_search_mode(self, mode):
+        if mode != self.search_mode:
+            self.search_mode = mode
+            self.filter_items(self.current_filter)
+
+    def filter_items(self, filter_text, mode=None):
+        self.current_filter = filter_text.strip()
+        mode = mode or self.search_mode
+
+        if not self.current_filter:
+            self.history_changed.emit([self.history_view.reset(self.full_history.entries())])
+            self.pinned_history_changed.emit(
+                [self.pinned_view.reset(self.full_pinned_history.entries())]
+            )
+            return
+
+        prepare = functools.partial(self.prepare_search, self.current_filter, mode)
+        if self.search_requested.handlers:
+            self.search_requested.emit(prepare)
+        else:
+            try:
+                self.apply_search_results(prepare()(None))
+            except RegexError as error:
+                self.search_failed.emit(str(error))
+
+    def search(self, query, mode=None, is_cancelled=None):
+        return self.prepare_search(query.strip(), mode or self.search_mode)(is_cancelled)
+
+    def prepare_search(self, query, mode):
+        plan = parse_query(query)
+        with self.lock:
+            if not plan.is_plain():
+                return self._prepare_plan_search(plan, mode)
+            return self._prepare_plain_search(plan, mode)
+
+    def _prepare_plain_search(self, plan, mode):
+        if mode == 'fuzzy':
+            query = plan.text
+            sources = [
+                (self.history_matcher, self.full_history.to_list(), self.history_version),
+                (self.pinned_matcher, self.full_pinned_history.to_list(), self.pinned_version)
+            ]
+
+            def search(is_cancelled):
+                return tuple(matcher.search(entries, query, version, is_cancelled)
+                             for matcher, entries, version in sources)
+        else:
+            sources = [
+                self._substring_source(self.full_history, self.history_index, plan),
+                self._substring_source(self.full_pinned_history, self.pinned_index, plan)
+            ]
+
+            def search(is_cancelled):
+                return tuple(self._search(pool, candidates, plan.terms, is_cancelled)
+                             for pool, candidates in sources)
+
+        return search
+
+    def _prepare_plan_search(self, plan, mode):
+        fuzzy = mode == 'fuzzy' and bool(plan.terms)
+        sources = []
+        for scope, entries, index, matcher in (
+                ('history', self.full_history, self.history_index, self.history_matcher),
+                ('pinned', self.full_pinned_history, self.pinned_index, self.pinned_matcher)):
+            if plan.includes(scope):
+                candidates = None if fuzzy else plan.candidates(index)
+                sources.append((list(entries.items()), candidates, matcher))
+            else:
+                sources.append(([], None, matcher))
+
+        def search(is_cancelled):
+            results = []
+            for items, candidates, matcher in sources:
+                texts = plan.run(items, candidates, is_cancelled, match_terms=not fuzzy)
+                if fuzzy:
+                    texts = matcher.search(texts, plan.text, None, is_cancelled)
+                results.append(texts)
+            return tuple(results)
+
+        return search
+
+    def apply_search_results(self, result):
+        history, pinned_history = result
+        self.history_changed.emit(
+            [self.history_view.reset(self._resolve_entries(self.full_history, history))]
+        )
+        pinned_entries = self._resolve_entries(self.full_pinned_history, pinned_history)
+        self.pinned_history_changed.emit([self.pinned_view.reset(pinned_entries)])
+
+    @staticmethod
+    def _resolve_entries(buffer, texts):
+        entries = []
+        for text in texts:
+            entry_id = buffer.entry_id(text)
+            if entry_id is not None:
+                entries.append((entry_id, text))
+        return entries
+
+    @staticmethod
+    def _substring_source(entries, index, plan):
+        candidates = plan.candidates(index)
+        if candidates is not None and len(candidates) * 4 < len(entries):
+            return sorted(candidates, key=entries.rank, reverse=True), None
+        return entries.to_list(), candidates
+
+    @staticmethod
+    def _search(pool, candidates, terms, is_cancelled=None):
+        result = []
+        for counter, text in enumerate(pool):
+            check_cancelled(counter, is_cancelled)
+            if candidates is not None and text not in candidates:
+                continue
+            lower = text.lower()
+            if all(term in lower for term in terms):
+                result.append(text)
+        return result
+
+    def _record(self, op, text=None, target='history'):
+        self.journal.append(op, text, target)
+        if self.journal.needs_compaction():
+            self.journal.compact(self.full_history, self.full_pinned_history)
+
+    def flush(self):
+        self.journal.flush()
+
+    def _update_history(self, changes, refilter=True):
+        self.history_version += 1
+        if self.current_filter and refilter:
+            self.filter_items(self.current_filter)
+            return
+        changes = [change for change in changes if change is not None]
+        if changes:
+            self.history_changed.emit(changes)
+
+    def _update_pinned_history(self, changes, refilter=True):
+        self.pinned_version += 1
+        if self.current_filter and refilter:
+            self.filter_items(self.current_filter)
+            return
+        changes = [change for change in changes if change is not None]
+        if changes:
+            self.pinned_history_changed.emit(changes)
@@ -0,0 +1,151 @@
+class HistoryChange:
+    INSERT = 'insert'
+    REMOVE = 'remove'
+    MOVE = 'move'
+    UPDATE = 'update'
+    RESET = 'reset'
+
+    __slots__ = ('kind', 'row', 'entries', 'new_row')
+
+    def __init__(self, kind, row=0, entries=(), new_row=0):
+        self.kind = kind
+        self.row = row
+        self.entries = entries
+        self.new_row = new_row
+
+    def __repr__(self):
+        return (f'HistoryChange({self.kind!r}, row={self.row}, new_row={self.new_row}, '
+                f'entries={len(self.entries)})')
+
+    @property
+    def entry_id(self):
+        return self.entries[0][0] if self.entries else None
+
+    @property
+    def value(self):
+        return self.entries[0][1] if self.entries else None
+
+
+class HistoryView:
+    def __init__(self):
+        self._slots = {}
+        self._relayout([])
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._slots
+
+    @property
+    def ids(self):
+        return [entry_id for entry_id in self._layout[self._lo:self._hi] if entry_id is not None]
+
+    def row(self, entry_id):
+        slot = self._slots.get(entry_id)
+        return None if slot is None else self._count_through(slot) - 1
+
+    def reset(self, entries):
+        entries = list(entries)
+        self._relayout([entry_id for entry_id, value in entries])
+        return HistoryChange(HistoryChange.RESET, entries=entries)
+
+    def insert(self, row, entries):
+        entries = list(entries)
+        ids = [entry_id for entry_id, value in entries]
+        if row == 0:
+            for entry_id in reversed(ids):
+                self._push_front(entry_id)
+        elif row == len(self._slots):
+            for entry_id in ids:
+                self._push_back(entry_id)
+        else:
+            layout = self.ids
+            layout[row:row] = ids
+            self._relayout(layout)
+        return HistoryChange(HistoryChange.INSERT, row, entries)
+
+    def append(self, entries):
+        return self.insert(len(self._slots), entries)
+
+    def remove(self, entry_id):
+        row = self.row(entry_id)
+        if row is None:
+            return None
+        self._take(entry_id)
+        return HistoryChange(HistoryChange.REMOVE, row, [(entry_id, None)])
+
+    def move_to_front(self, entry):
+        entry_id = entry[0]
+        row = self.row(entry_id)
+        if row is None:
+            return self.insert(0, [entry])
+
+        if row:
+            self._take(entry_id)
+            self._push_front(entry_id)
+        return HistoryChange(HistoryChange.MOVE, row, [entry], 0)
+
+    def update(self, entry):
+        row = self.row(entry[0])
+        if row is None:
+            return None
+        return HistoryChange(HistoryChange.UPDATE, row, [entry])
+
+    def _relayout(self, ids):
+        capacity = 2 * len(ids) + 64
+        self._lo = self._hi = (capacity - len(ids)) // 2
+        self._layout = [None] * capacity
+        self._tree = [0] * (capacity + 1)
+        self._slots = {}
+        for entry_id in ids:
+            self._layout[self._hi] = entry_id
+            self._slots[entry_id] = self._hi
+            self._hi += 1
+
+        tree = self._tree
+        for slot in range(self._lo, self._hi):
+            tree[slot + 1] += 1
+        for index in range(1, capacity + 1):
+            parent = index + (index & -index)
+            if parent <= capacity:
+                tree[parent] += tree[index]
+
+    def _push_front(self, entry_id):
+        if self._lo == 0:
+            self._relayout(self.ids)
+        self._lo -= 1
+        self._place(entry_id, self._lo)
+
+    def _push_back(self, entry_id):
+        if self._hi == len(self._layout):
+            self._relayout(self.ids)
+        self._place(entry_id, self._hi)
+        self._hi += 1
+
+    def _place(self, entry_id, slot):
+        self._layout[slot] = entry_id
+        self._slots[entry_id] = slot
+        self._add(slot, 1)
+
+    def _take(self, entry_id):
+        slot = self._slots.pop(entry_id)
+        self._layout[slot] = None
+        self._add(slot, -1)
+        while self._hi > self._lo and self._layout[self._hi - 1] is None:
+            self._hi -= 1
+        while self._lo < self._hi and self._layout[self._lo] is None:
+            self._lo += 1
+
+    def _add(self, slot, delta):
+        index = slot + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _count_through(self, slot):
+        index, total = slot + 1, 0
+        while index:
+            total += self._tree[index]
+            index -= index & -index
+        return total
@@ -0,0 +1,136 @@
+import json, os, shutil, threading, time
+from src.core.history_buffer import HistoryBuffer
+
+
+class HistoryJournal:
+    def __init__(self, file_path, store, compact_threshold=500):
+        self.file_path = file_path
+        self.rotated_path = file_path + '.compacting'
+        self.store = store
+        self.compact_threshold = compact_threshold
+
+        self.seq = 0
+        self.pending_events = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._compaction_thread = None
+
+    def load(self, max_size):
+        history_items, pinned_items, snapshot_seq = self.store.load_snapshot()
+        self.seq = snapshot_seq
+
+        history = HistoryBuffer(max_size)
+        for text, created_at in history_items:
+            history.append_older(text, created_at)
+        pinned = HistoryBuffer()
+        for text, created_at in pinned_items:
+            pinned.append_older(text, created_at)
+
+        replayed = 0
+        for path in (self.rotated_path, self.file_path):
+            for record in self._read_records(path):
+                if not isinstance(record, dict) or record.get('seq', 0) <= snapshot_seq:
+                    continue
+                self.apply(record, history, pinned)
+                self.seq = max(self.seq, record['seq'])
+                replayed += 1
+
+        self._file = open(self.file_path, 'a', encoding='utf-8', newline='\n')
+        self.pending_events = replayed
+
+        if os.path.exists(self.rotated_path):
+            self.store.write_snapshot(list(history.items()), list(pinned.items()), self.seq)
+            os.remove(self.rotated_path)
+            self._file.truncate(0)
+            self.pending_events = 0
+
+        return history, pinned
+
+    def append(self, op, text=None, target='history'):
+        with self._lock:
+            self.seq += 1
+            record = {'seq': self.seq, 'op': op, 'target': target, 'ts': time.time()}
+            if text is not None:
+                record['text'] = text
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+            self.pending_events += 1
+
+    def needs_compaction(self):
+        return self.pending_events >= self.compact_threshold and not self.is_compacting()
+
+    def is_compacting(self):
+        return self._compaction_thread is not None and self._compaction_thread.is_alive()
+
+    def compact(self, history, pinned):
+        if self.is_compacting():
+            return
+
+        with self._lock:
+            self._file.close()
+            if os.path.exists(self.rotated_path):
+                with open(self.file_path, 'rb') as src, open(self.rotated_path, 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.file_path)
+            else:
+                os.replace(self.file_path, self.rotated_path)
+            self._file = open(self.file_path, 'a', encoding='utf-8', newline='\n')
+            seq = self.seq
+            self.pending_events = 0
+
+        self._compaction_thread = threading.Thread(
+            target=self._write_snapshot, args=(list(history.items()), list(pinned.items()), seq),
+            name='history-compaction', daemon=True
+        )
+        self._compaction_thread.start()
+
+    def flush(self):
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def _write_snapshot(self, history, pinned, seq):
+        try:
+            self.store.write_snapshot(history, pinned, seq)
+            os.remove(self.rotated_path)
+        except Exception:
+            pass
+
+    @staticmethod
+    def apply(record, history, pinned):
+        op = record.get('op')
+        text = record.get('text')
+        entries = pinned if record.get('target') == 'pinned' else history
+
+        if op in ('add', 'pin') and text:
+            entries.add(text, record.get('ts'))
+        elif op in ('delete', 'unpin'):
+            entries.remove(text)
+        elif op == 'clear':
+            entries.clear()
+
+    @staticmethod
+    def _read_records(path):
+        if not os.path.exists(path):
+            return []
+
+        records = []
+        valid_size = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                valid_size += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+
+        if valid_size != os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(valid_size)
+
+        return records
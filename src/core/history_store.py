@@ -0,0 +1,221 @@
+import os, sqlite3, threading, time
+from collections import namedtuple
+from contextlib import contextmanager
+from src.core.blob_store import BlobStore, png_dimensions
+
+ImageEntry = namedtuple('ImageEntry', 'image_id width height size created_at phash',
+                        defaults=(None,))
+
+
+class HistoryStore:
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._lock = threading.RLock()
+
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.connection = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.create_tables()
+
+    def create_tables(self):
+        with self._lock:
+            image_columns = [row[1] for row in self.connection.execute('PRAGMA table_info(images)')]
+            if 'data' in image_columns:
+                self.connection.execute('ALTER TABLE images RENAME TO images_legacy')
+
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pinned_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS images (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    digest TEXT NOT NULL UNIQUE,
+                    width INTEGER NOT NULL,
+                    height INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    phash TEXT
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS tabs_data (
+                    name TEXT PRIMARY KEY,
+                    content TEXT NOT NULL
+                );
+            ''')
+
+            image_columns = [row[1] for row in self.connection.execute('PRAGMA table_info(images)')]
+            if 'phash' not in image_columns:
+                self.connection.execute('ALTER TABLE images ADD COLUMN phash TEXT')
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self.connection.execute('BEGIN')
+            try:
+                yield self.connection
+            except Exception:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def is_empty(self):
+        with self._lock:
+            for table in ('history', 'pinned_history', 'images', 'tabs_data'):
+                if self.connection.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchone():
+                    return False
+            return True
+
+    def load_snapshot(self):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = 'journal_seq'"
+            ).fetchone()
+            return self._load_items('history'), self._load_items('pinned_history'), int(row[0]) if row else 0
+
+    def write_snapshot(self, history_items, pinned_items, seq):
+        with self.transaction():
+            for table, items in (('history', history_items), ('pinned_history', pinned_items)):
+                self.connection.execute(f'DELETE FROM {table}')
+                self.connection.executemany(
+                    f'INSERT INTO {table} (text, created_at) VALUES (?, ?)', reversed(items)
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('journal_seq', ?)", (str(seq),)
+            )
+
+    def load_images(self):
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT digest, width, height, size, created_at, phash FROM images '
+                'ORDER BY id DESC'
+            ).fetchall()
+        return [ImageEntry(*row) for row in rows]
+
+    def add_image(self, entry):
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR IGNORE INTO images (digest, width, height, size, created_at, phash) '
+                'VALUES (?, ?, ?, ?, ?, ?)', entry
+            )
+
+    def set_image_phash(self, image_id, phash):
+        with self._lock:
+            self.connection.execute(
+                'UPDATE images SET phash = ? WHERE digest = ?', (phash, image_id)
+            )
+
+    def remove_image(self, image_id):
+        with self._lock:
+            self.connection.execute('DELETE FROM images WHERE digest = ?', (image_id,))
+
+    def migrate_legacy_images(self, blob_store, image_id=BlobStore.digest):
+        with self._lock:
+            exists = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'images_legacy'"
+            ).fetchone()
+            if not exists:
+                return
+
+            rows = self.connection.execute(
+                'SELECT data, created_at FROM images_legacy ORDER BY id'
+            ).fetchall()
+            with self.transaction():
+                for data, created_at in rows:
+                    digest = blob_store.put(data, image_id(data))
+                    self.add_image(self.image_entry(digest, data, created_at))
+                self.connection.execute('DROP TABLE images_legacy')
+
+    def trim_images(self, max_size):
+        self._trim('images', max_size)
+
+    def clear_images(self):
+        self._clear('images')
+
+    def load_tab_names(self):
+        with self._lock:
+            rows = self.connection.execute('SELECT name FROM tabs_data ORDER BY rowid').fetchall()
+        return [row[0] for row in rows]
+
+    def load_tab(self, name):
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT content FROM tabs_data WHERE name = ?', (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_tab(self, name, content):
+        with self._lock:
+            self.connection.execute(
+                'INSERT INTO tabs_data (name, content) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET content = excluded.content',
+                (name, content)
+            )
+
+    def rename_tab(self, old_name, new_name, content):
+        with self.transaction():
+            self.connection.execute('DELETE FROM tabs_data WHERE name = ?', (old_name,))
+            self.save_tab(new_name, content)
+
+    def remove_tab(self, name):
+        with self._lock:
+            self.connection.execute('DELETE FROM tabs_data WHERE name = ?', (name,))
+
+    def import_legacy(self, history, pinned_history, images, tabs_data):
+        with self.transaction():
+            now = time.time()
+            self.connection.executemany(
+                'INSERT INTO history (text, created_at) VALUES (?, ?)',
+                [(text, now) for text in reversed(history)]
+            )
+            self.connection.executemany(
+                'INSERT INTO pinned_history (text, created_at) VALUES (?, ?)',
+                [(text, now) for text in reversed(pinned_history)]
+            )
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO images (digest, width, height, size, created_at, phash) '
+                'VALUES (?, ?, ?, ?, ?, ?)', list(reversed(images))
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO tabs_data (name, content) VALUES (?, ?)',
+                list(tabs_data.items())
+            )
+
+    def _load_items(self, table):
+        with self._lock:
+            return self.connection.execute(
+                f'SELECT text, created_at FROM {table} ORDER BY id DESC'
+            ).fetchall()
+
+    def _trim(self, table, max_size):
+        with self._lock:
+            self.connection.execute(
+                f'DELETE FROM {table} WHERE id NOT IN '
+                f'(SELECT id FROM {table} ORDER BY id DESC LIMIT ?)', (max_size,)
+            )
+
+    def _clear(self, table):
+        with self._lock:
+            self.connection.execute(f'DELETE FROM {table}')
+
+    @staticmethod
+    def image_entry(image_id, data, created_at=None):
+        width, height = png_dimensions(data)
+        return ImageEntry(image_id, width, height, len(data), created_at or time.time())
@@ -0,0 +1,94 @@
+from src.core.hamming_index import HammingIndex
+from src.core.history_events import HistoryView
+
+
+class ImageLibrary:
+    def __init__(self, settings):
+        self.settings = settings
+        self.max_bytes = settings.get('max_images_bytes')
+
+        self.images = []
+        self.image_ids = set()
+        self.near_duplicates = {}
+        self.phash_index = HammingIndex()
+        self.view = HistoryView()
+
+    def __contains__(self, image_id):
+        return image_id in self.image_ids
+
+    def get(self, image_id):
+        if image_id in self.image_ids:
+            for entry in self.images:
+                if entry.image_id == image_id:
+                    return entry
+        return None
+
+    def row(self, image_id):
+        return self.view.row(image_id)
+
+    def append(self, entries):
+        self.images.extend(entries)
+        self.image_ids.update(entry.image_id for entry in entries)
+        for entry in entries:
+            self.phash_index.add(entry.image_id, entry.phash)
+        return self.view.append(self._entries(entries))
+
+    def insert(self, entry):
+        self.phash_index.add(entry.image_id, entry.phash)
+        self.images.insert(0, entry)
+        self.image_ids.add(entry.image_id)
+        return self.view.insert(0, self._entries([entry]))
+
+    def remove(self, entries):
+        changes = []
+        dropped = {entry.image_id for entry in entries}
+        for entry in entries:
+            self.near_duplicates.pop(entry.image_id, None)
+            self.phash_index.remove(entry.image_id)
+            changes.append(self.view.remove(entry.image_id))
+
+        self.images = [entry for entry in self.images if entry.image_id not in dropped]
+        self.image_ids -= dropped
+        return [change for change in changes if change is not None]
+
+    def clear(self):
+        self.images = []
+        self.image_ids = set()
+        self.near_duplicates = {}
+        self.phash_index.clear()
+        return self.view.reset([])
+
+    def find_near_duplicate(self, entry):
+        if self.settings.get('image_dedup_mode', 'collapse') == 'off':
+            return None
+        match = self.phash_index.nearest(entry.phash, self.settings.get('image_dedup_threshold', 3))
+        return match[0] if match else None
+
+    def superseded_by(self, entry):
+        duplicate_id = self.find_near_duplicate(entry)
+        if duplicate_id is None:
+            return []
+        if self.settings.get('image_dedup_mode', 'collapse') == 'collapse':
+            return [self.get(duplicate_id)]
+        self.near_duplicates[entry.image_id] = duplicate_id
+        return []
+
+    def is_near_duplicate(self, image_id):
+        return image_id in self.near_duplicates
+
+    def total_bytes(self):
+        return sum(entry.size for entry in self.images)
+
+    def over_budget(self):
+        total = self.total_bytes()
+        evicted = []
+        for entry in reversed(self.images[1:]):
+            if total <= self.max_bytes:
+                break
+            evicted.append(entry)
+            total -= entry.size
+        return evicted
+
+    @staticmethod
+    def _entries(entries):
+        return [(entry.image_id, entry) for entry in entries]
@@ -0,0 +1,288 @@
+import json, logging, os, selectors, socket, threading
+from collections import deque
+
+logger = logging.getLogger('clipmate.ipc')
+
+RECV_SIZE = 64 * 1024
+MAX_LINE_BYTES = 4 * 1024 * 1024
+MAX_OUTGOING_BYTES = 16 * 1024 * 1024
+SERVER_OPS = ('subscribe', 'unsubscribe')
+INVALID_JSON = object()
+
+
+def encode_message(message):
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class IpcConnection:
+    def __init__(self, sock):
+        self.sock = sock
+        self.incoming = bytearray()
+        self.outgoing = bytearray()
+        self.subscribed = False
+        self.busy = False
+
+    def write(self, message):
+        self.outgoing += encode_message(message)
+
+
+class IpcServer:
+    def __init__(self, path, handler):
+        self.path = path
+        self.handler = handler
+
+        self._selector = None
+        self._listener = None
+        self._thread = None
+        self._connections = {}
+        self._events = deque()
+        self._completions = deque()
+        self._wakeup_reader, self._wakeup_writer = None, None
+        self._stopping = False
+
+    @staticmethod
+    def is_supported():
+        return hasattr(socket, 'AF_UNIX')
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running() or not self.is_supported():
+            return False
+        if not self._claim_path():
+            logger.warning('another instance is listening on %s', self.path)
+            return False
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self.path)
+            os.chmod(self.path, 0o600)
+        except OSError as error:
+            listener.close()
+            logger.warning('cannot listen on %s: %s', self.path, error)
+            return False
+        listener.listen(16)
+        listener.setblocking(False)
+
+        self._listener = listener
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(listener, selectors.EVENT_READ)
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ)
+        self._stopping = False
+
+        self._thread = threading.Thread(target=self._run, name='ipc-server', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if not self.is_running():
+            return
+        self._stopping = True
+        self._wake()
+        self._thread.join(1.0)
+        self._thread = None
+
+    def publish(self, event):
+        if self.is_running():
+            self._events.append(event)
+            self._wake()
+
+    def _claim_path(self):
+        if not os.path.exists(self.path):
+            return True
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.remove(self.path)
+            return True
+        finally:
+            probe.close()
+        return False
+
+    def _wake(self):
+        try:
+            self._wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                for key, mask in self._selector.select():
+                    if key.fileobj is self._listener:
+                        self._accept()
+                    elif key.fileobj is self._wakeup_reader:
+                        self._drain_wakeups()
+                    else:
+                        self._service(key.data, mask)
+                self._complete_requests()
+                self._publish_events()
+        finally:
+            self._shutdown()
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        connection = IpcConnection(sock)
+        self._connections[sock] = connection
+        self._selector.register(sock, selectors.EVENT_READ, connection)
+
+    def _drain_wakeups(self):
+        try:
+            while self._wakeup_reader.recv(RECV_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _service(self, connection, mask):
+        if mask & selectors.EVENT_READ:
+            try:
+                data = connection.sock.recv(RECV_SIZE)
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b''
+            if data == b'':
+                self._close(connection)
+                return
+            if data:
+                connection.incoming += data
+                self._process(connection)
+                if len(connection.incoming) > MAX_LINE_BYTES:
+                    logger.warning('dropping ipc client with too much unanswered input')
+                    self._close(connection)
+                    return
+        self._flush(connection)
+
+    def _process(self, connection):
+        if connection.busy or b'\n' not in connection.incoming:
+            return
+        *lines, rest = connection.incoming.split(b'\n')
+        connection.incoming = bytearray(rest)
+
+        batches = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                batches.append((False, [INVALID_JSON]))
+                continue
+            if isinstance(message, list):
+                batches.append((True, message))
+            else:
+                batches.append((False, [message]))
+
+        pending = []
+        for is_batch, requests in batches:
+            for request in requests:
+                if isinstance(request, dict) and request.get('op') not in SERVER_OPS:
+                    pending.append(request)
+
+        if not pending:
+            self._write_responses(connection, batches, iter(()))
+            return
+
+        connection.busy = True
+
+        def reply(results):
+            self._completions.append((connection, batches, results))
+            self._wake()
+
+        try:
+            self.handler(pending, reply)
+        except Exception as error:
+            logger.exception('ipc handler failed')
+            reply([{'error': str(error)}] * len(pending))
+
+    def _complete_requests(self):
+        while self._completions:
+            connection, batches, results = self._completions.popleft()
+            connection.busy = False
+            if connection.sock not in self._connections:
+                continue
+            self._write_responses(connection, batches, iter(results))
+            self._process(connection)
+            self._flush(connection)
+
+    def _write_responses(self, connection, batches, results):
+        for is_batch, requests in batches:
+            responses = [self._respond(connection, request, results) for request in requests]
+            connection.write(responses if is_batch else responses[0])
+
+    @staticmethod
+    def _respond(connection, request, results):
+        if request is INVALID_JSON:
+            return {'error': 'invalid json'}
+        if not isinstance(request, dict):
+            return {'error': 'request must be an object'}
+
+        op = request.get('op')
+        if op in SERVER_OPS:
+            connection.subscribed = op == 'subscribe'
+            response = {'result': connection.subscribed}
+        else:
+            response = next(results, {'error': 'no response'})
+        if 'id' in request:
+            response = {'id': request['id'], **response}
+        return response
+
+    def _flush(self, connection):
+        if connection.sock not in self._connections:
+            return
+        if connection.outgoing:
+            try:
+                sent = connection.sock.send(connection.outgoing)
+                del connection.outgoing[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._close(connection)
+                return
+
+        if len(connection.outgoing) > MAX_OUTGOING_BYTES:
+            logger.warning('dropping ipc client with %d pending bytes', len(connection.outgoing))
+            self._close(connection)
+            return
+
+        events = selectors.EVENT_READ
+        if connection.outgoing:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(connection.sock, events, connection)
+
+    def _publish_events(self):
+        while self._events:
+            event = self._events.popleft()
+            for connection in list(self._connections.values()):
+                if connection.subscribed:
+                    connection.write(event)
+                    self._flush(connection)
+
+    def _close(self, connection):
+        self._connections.pop(connection.sock, None)
+        try:
+            self._selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
+        connection.sock.close()
+
+    def _shutdown(self):
+        for connection in list(self._connections.values()):
+            self._close(connection)
+        self._selector.close()
+        self._listener.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,104 @@
+import copy, json, os, tempfile, threading, time
+
+
+class PersistenceScheduler:
+    def __init__(self, file_path, state, delay=0.5):
+        self.file_path = file_path
+        self.delay = delay
+
+        self._state = copy.deepcopy(state)
+        self._dirty = {}
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name='settings-writer', daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, key, value):
+        with self._condition:
+            self._dirty[key] = copy.deepcopy(value)
+            self._condition.notify_all()
+
+    def schedule(self, values):
+        with self._condition:
+            for key, value in values.items():
+                self._dirty[key] = copy.deepcopy(value)
+            self._condition.notify_all()
+
+    def flush(self):
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while (self._dirty or self._writing) and self._thread.is_alive():
+                self._condition.wait(0.1)
+            self._flush_requested = False
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=2)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._dirty and not self._closed:
+                    self._condition.wait()
+
+                if not self._dirty:
+                    return
+
+                deadline = time.monotonic() + self.delay
+                while not self._flush_requested and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                self._state.update(self._dirty)
+                self._dirty = {}
+                state = self._state
+                self._writing = True
+
+            try:
+                self.write_atomic(self.file_path, state)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    @staticmethod
+    def write_atomic(file_path, data):
+        directory = os.path.dirname(os.path.abspath(file_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix='.clipmate_', suffix='.tmp', dir=directory)
+        except Exception:
+            return False
+
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+
+        if hasattr(os, 'O_DIRECTORY'):
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+        return True
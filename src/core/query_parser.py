@@ -0,0 +1,136 @@
+import re
+from datetime import datetime
+from src.core.cancellation import check_cancelled
+from src.core.regex_worker import regex_matches, validate_regex
+
+TOKEN_PATTERN = re.compile(r'(?:[^\s"]+|"[^"]*")+')
+LENGTH_PATTERN = re.compile(r'^len(>=|<=|>|<|=)(\d+)$')
+
+TYPE_SCAN_LIMIT = 2048
+REGEX_SCAN_LIMIT = 20000
+
+TYPE_PATTERNS = {
+    'url': re.compile(r'^(?:(?:https?|ftp)://|www\.)\S+$', re.IGNORECASE),
+    'email': re.compile(r'^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$'),
+    'number': re.compile(r'^[+-]?\d[\d\s]*(?:[.,]\d+)?$'),
+    'path': re.compile(r'^(?:[a-zA-Z]:[\\/]|\\\\|~?/)[^\n]*$'),
+    'multiline': re.compile(r'\n'),
+}
+
+LENGTH_OPERATORS = {
+    '>': lambda length, value: length > value,
+    '<': lambda length, value: length < value,
+    '>=': lambda length, value: length >= value,
+    '<=': lambda length, value: length <= value,
+    '=': lambda length, value: length == value,
+}
+
+
+def parse_date(value):
+    for date_format in ('%Y-%m-%d', '%d.%m.%Y', '%Y-%m-%dT%H:%M'):
+        try:
+            return datetime.strptime(value, date_format).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def unquote(value):
+    return value.replace('"', '')
+
+
+class QueryPlan:
+    def __init__(self):
+        self.terms = []
+        self.regexes = []
+        self.types = []
+        self.length_filters = []
+        self.after = None
+        self.before = None
+        self.scope = 'all'
+
+    @property
+    def text(self):
+        return ' '.join(self.terms)
+
+    def is_plain(self):
+        return not (self.regexes or self.types or self.length_filters
+                    or self.after is not None or self.before is not None
+                    or self.scope != 'all')
+
+    def includes(self, scope):
+        return self.scope in ('all', scope)
+
+    def candidates(self, index):
+        if index is None:
+            return None
+
+        result = None
+        for term in self.terms:
+            term_candidates = index.candidates(term)
+            if term_candidates is None:
+                continue
+            result = term_candidates if result is None else result & term_candidates
+            if not result:
+                break
+        return result
+
+    def run(self, items, candidates=None, is_cancelled=None, match_terms=True):
+        terms = self.terms if match_terms else []
+        result = []
+
+        for counter, (text, created_at) in enumerate(items):
+            check_cancelled(counter, is_cancelled)
+
+            if candidates is not None and text not in candidates:
+                continue
+            if self.after is not None and (created_at or 0) < self.after:
+                continue
+            if self.before is not None and (created_at or 0) >= self.before:
+                continue
+            if self.length_filters and not all(
+                    operator(len(text), value) for operator, value in self.length_filters):
+                continue
+            if self.types:
+                sample = text[:TYPE_SCAN_LIMIT].strip()
+                if not all(TYPE_PATTERNS[name].search(sample) for name in self.types):
+                    continue
+            if terms:
+                lower = text.lower()
+                if not all(term in lower for term in terms):
+                    continue
+
+            result.append(text)
+
+        if self.regexes and result:
+            samples = [text[:REGEX_SCAN_LIMIT] for text in result]
+            result = [result[index]
+                      for index in regex_matches(self.regexes, samples, is_cancelled)]
+        return result
+
+
+def parse_query(query):
+    plan = QueryPlan()
+
+    for token in TOKEN_PATTERN.findall(query.strip()):
+        key, separator, value = token.partition(':')
+        key = key.lower()
+        value = unquote(value)
+
+        length_match = LENGTH_PATTERN.match(token.lower())
+        if length_match:
+            plan.length_filters.append(
+                (LENGTH_OPERATORS[length_match.group(1)], int(length_match.group(2)))
+            )
+        elif separator and key == 're' and value:
+            plan.regexes.append(validate_regex(value))
+        elif separator and key == 'type' and value.lower() in TYPE_PATTERNS:
+            plan.types.append(value.lower())
+        elif separator and key == 'pinned':
+            plan.scope = 'history' if value.lower() in ('no', 'false', '0') else 'pinned'
+        elif separator and key in ('after', 'before') and parse_date(value) is not None:
+            setattr(plan, key, parse_date(value))
+        elif unquote(token):
+            plan.terms.append(unquote(token).lower())
+
+    return plan
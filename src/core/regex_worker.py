@@ -0,0 +1,132 @@
+import functools, multiprocessing, re, threading, time
+from src.core.cancellation import SearchCancelled, check_cancelled
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+REGEX_TIMEOUT = 1.5
+POLL_INTERVAL = 0.05
+CHUNK_SIZE = 1000
+STARTUP_TIMEOUT = 10.0
+
+
+class RegexError(ValueError):
+    pass
+
+
+def validate_regex(pattern):
+    try:
+        re.compile(pattern, REGEX_FLAGS)
+    except re.error as error:
+        raise RegexError(f'Некорректное регулярное выражение {pattern!r}: {error}') from None
+    return pattern
+
+
+@functools.lru_cache(maxsize=64)
+def _compile(pattern):
+    return re.compile(pattern, REGEX_FLAGS)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_re2(patterns):
+    if re2 is None:
+        return None
+    try:
+        return [re2.compile('(?im)' + pattern) for pattern in patterns]
+    except Exception:
+        return None
+
+
+def _serve(connection):
+    connection.send(None)
+    while True:
+        try:
+            patterns, texts = connection.recv()
+        except EOFError:
+            return
+        regexes = [_compile(pattern) for pattern in patterns]
+        connection.send([index for index, text in enumerate(texts)
+                         if all(regex.search(text) for regex in regexes)])
+
+
+class RegexWorker:
+    def __init__(self, timeout=REGEX_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._process = None
+        self._connection = None
+
+    def filter(self, patterns, texts, is_cancelled=None):
+        with self._lock:
+            self._ensure_started()
+            deadline = time.monotonic() + self.timeout
+            result = []
+            for start in range(0, len(texts), CHUNK_SIZE):
+                self._check(deadline, is_cancelled)
+                self._connection.send((patterns, texts[start:start + CHUNK_SIZE]))
+                while not self._connection.poll(POLL_INTERVAL):
+                    self._check(deadline, is_cancelled)
+                result.extend(start + index for index in self._connection.recv())
+            return result
+
+    def _check(self, deadline, is_cancelled):
+        if is_cancelled is not None and is_cancelled():
+            self._stop()
+            raise SearchCancelled()
+        if time.monotonic() > deadline:
+            self._stop()
+            raise RegexError('Регулярное выражение выполняется слишком долго')
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self._stop()
+        context = multiprocessing.get_context('spawn')
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child_connection,),
+                                                name='clipmate-regex', daemon=True)
+        self._process.start()
+        child_connection.close()
+        try:
+            if self._connection.poll(STARTUP_TIMEOUT):
+                self._connection.recv()
+                return
+        except (EOFError, OSError):
+            pass
+        self._stop()
+        raise RegexError('Не удалось запустить обработчик регулярных выражений')
+
+    def _stop(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._process = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+_worker = RegexWorker()
+
+
+def regex_matches(patterns, texts, is_cancelled=None):
+    if not texts:
+        return []
+
+    regexes = _compile_re2(tuple(patterns))
+    if regexes is None:
+        return _worker.filter(patterns, texts, is_cancelled)
+
+    result = []
+    for index, text in enumerate(texts):
+        check_cancelled(index, is_cancelled)
+        if all(regex.search(text) for regex in regexes):
+            result.append(index)
+    return result
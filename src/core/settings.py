@@ -0,0 +1,103 @@
+import base64, json, os
+from src.core.blob_store import BlobStore
+from src.core.events import EventEmitter
+from src.core.history_store import HistoryStore
+from src.core.persistence import PersistenceScheduler
+from src.core.tab_writer import TabWriter
+
+MEGABYTE = 1024 * 1024
+LEGACY_STORE_KEYS = ('history', 'pinned_history', 'images', 'tabs_data')
+
+
+class Settings:
+    def __init__(self, data_dir='../data', image_id=BlobStore.digest):
+        self.setting_file = os.path.join(data_dir, 'clipmate_settings.json')
+        self.database_file = os.path.join(data_dir, 'clipmate.db')
+        self.journal_file = os.path.join(data_dir, 'history.journal')
+        self.thumbnail_dir = os.path.join(data_dir, 'thumbs')
+        self.socket_file = os.path.join(data_dir, 'clipmate.sock')
+        self.blob_store = BlobStore(os.path.join(data_dir, 'blobs'))
+        self.image_id = image_id
+        self.store = HistoryStore(self.database_file)
+        self.store.migrate_legacy_images(self.blob_store, image_id)
+        self.tabs = TabWriter(self.store)
+        self.changed = EventEmitter()
+        self.has_legacy_data = False
+        self.settings = self.load_settings()
+        self.persistence = PersistenceScheduler(self.setting_file, self.settings)
+
+        if self.has_legacy_data:
+            self.save_settings()
+
+    def load_settings(self):
+        default_settings = {
+            'max_history_size': 10,
+            'max_image_bytes': 4 * MEGABYTE,
+            'max_images_bytes': 128 * MEGABYTE,
+            'max_image_pixels': 12_000_000,
+            'image_keep_original': False,
+            'restore_clipboard_after_paste': False,
+            'quick_paste_hotkeys': True,
+            'paste_queue_separator': 'tab',
+            'ipc_server': True,
+            'image_dedup_mode': 'collapse',
+            'image_dedup_threshold': 3,
+            'global_hotkey': 'Ctrl+Shift+H',
+            'tabs_order': ['Главная', 'Изображения', 'Избранное'],
+            'current_theme': 'light'
+        }
+
+        loaded_settings = {}
+        if os.path.exists(self.setting_file):
+            try:
+                with open(self.setting_file, 'r', encoding='utf-8') as f:
+                    loaded_settings = json.load(f)
+            except Exception:
+                pass
+
+        legacy_data = {key: loaded_settings.pop(key) for key in LEGACY_STORE_KEYS
+                       if key in loaded_settings}
+        loaded_settings.pop('max_images_size', None)
+        default_settings.update(loaded_settings)
+
+        if legacy_data:
+            self.migrate_legacy_data(legacy_data)
+            self.has_legacy_data = True
+
+        return default_settings
+
+    def migrate_legacy_data(self, legacy_data):
+        if not self.store.is_empty():
+            return
+
+        images = []
+        for image_base64 in legacy_data.get('images') or []:
+            try:
+                data = base64.b64decode(image_base64.split(',')[-1])
+                image_id = self.blob_store.put(data, self.image_id(data))
+                images.append(self.store.image_entry(image_id, data))
+            except Exception:
+                pass
+
+        self.store.import_legacy(
+            legacy_data.get('history') or [],
+            legacy_data.get('pinned_history') or [],
+            images,
+            legacy_data.get('tabs_data') or {}
+        )
+
+    def save_settings(self):
+        self.persistence.schedule(self.settings)
+
+    def flush(self):
+        self.tabs.flush()
+        self.persistence.flush()
+
+    def get(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def set(self, key, value):
+        if self.settings.get(key) != value:
+            self.settings[key] = value
+            self.changed.emit(key, value)
+            self.persistence.mark_dirty(key, value)
@@ -0,0 +1,87 @@
+import logging, threading
+from collections import deque
+
+logger = logging.getLogger('clipmate.tabs')
+
+REMOVED = object()
+
+
+class TabWriter:
+    def __init__(self, store):
+        self.store = store
+
+        self._operations = deque()
+        self._pending = {}
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name='tab-writer', daemon=True)
+        self._thread.start()
+
+    def save(self, name, content):
+        self._submit((self.store.save_tab, name, content), {name: content})
+
+    def rename(self, old_name, new_name, content):
+        self._submit((self.store.rename_tab, old_name, new_name, content),
+                     {old_name: REMOVED, new_name: content})
+
+    def remove(self, name):
+        self._submit((self.store.remove_tab, name), {name: REMOVED})
+
+    def load(self, name):
+        with self._condition:
+            content = self._pending.get(name)
+        if content is REMOVED:
+            return None
+        if content is not None:
+            return content
+        return self.store.load_tab(name)
+
+    def load_names(self):
+        with self._condition:
+            pending = dict(self._pending)
+        names = [name for name in self.store.load_tab_names() if pending.get(name) is not REMOVED]
+        names += [name for name, content in pending.items()
+                  if content is not REMOVED and name not in names]
+        return names
+
+    def flush(self):
+        with self._condition:
+            while (self._operations or self._writing) and self._thread.is_alive():
+                self._condition.wait(0.1)
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=2)
+
+    def _submit(self, operation, pending):
+        with self._condition:
+            self._operations.append((operation, pending))
+            self._pending.update(pending)
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._operations and not self._closed:
+                    self._condition.wait()
+                if not self._operations:
+                    return
+                (method, *args), pending = self._operations.popleft()
+                self._writing = True
+
+            try:
+                method(*args)
+            except Exception:
+                logger.exception('cannot write tab %r', args[0])
+            finally:
+                with self._condition:
+                    for name, content in pending.items():
+                        if self._pending.get(name) is content:
+                            del self._pending[name]
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+
+class TrigramIndex:
+    def __init__(self, texts=()):
+        self._postings = defaultdict(set)
+        for text in texts:
+            self.add(text)
+
+    def add(self, text):
+        for trigram in self.trigrams(text):
+            self._postings[trigram].add(text)
+
+    def remove(self, text):
+        for trigram in self.trigrams(text):
+            posting = self._postings.get(trigram)
+            if posting is not None:
+                posting.discard(text)
+                if not posting:
+                    del self._postings[trigram]
+
+    def clear(self):
+        self._postings.clear()
+
+    def candidates(self, query):
+        trigrams = self.trigrams(query)
+        if not trigrams:
+            return None
+
+        postings = []
+        for trigram in trigrams:
+            posting = self._postings.get(trigram)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def trigrams(text):
+        text = text.lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
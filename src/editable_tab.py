@@ -60,10 +60,7 @@ class EditableTabWidget(QWidget):
 
     def save_content(self):
         content = self.text_edit.toPlainText()
-        tabs_data = self.settings.get('tabs_data', {})
-        tabs_data[self.tab_name] = content
-        self.settings.set('tabs_data', tabs_data)
-        self.settings.save_settings()
+        self.settings.tabs.save(self.tab_name, content)
         self.unsaved_changes = False
         self.last_save_time = time.time()
         self.status_label.setText(f'Сохранено ({time.strftime("%H:%M:%S")})')
@@ -71,9 +68,8 @@ class EditableTabWidget(QWidget):
         return True
 
     def load_saved_content(self):
-        tabs_data = self.settings.get('tabs_data', {})
-        if self.tab_name in tabs_data:
-            content = tabs_data[self.tab_name]
+        content = self.settings.tabs.load(self.tab_name)
+        if content is not None:
             self.text_edit.setPlainText(content)
             self.unsaved_changes = False
             self.status_label.setText('Загружено из сохранения')
@@ -97,17 +93,8 @@ class EditableTabWidget(QWidget):
         if self.tab_name == new_name:
             return
 
-        data = self.settings.get('tabs_data', {}).copy()
-
         current_text = self.text_edit.toPlainText()
-
-        if self.tab_name in data:
-            data.pop(self.tab_name)
-
-        data[new_name] = current_text
-
-        self.settings.set('tabs_data', data)
-        self.settings.save_settings()
+        self.settings.tabs.rename(self.tab_name, new_name, current_text)
 
         self.tab_name = new_name
         self.unsaved_changes = False
\ No newline at end of file
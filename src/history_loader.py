@@ -0,0 +1,57 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+from src.perceptual_hash import dhash
+from src.thumbnail_cache import make_thumbnail
+from src.core.trigram_index import TrigramIndex
+
+
+class HistoryLoader(QThread):
+    history_chunk_loaded = pyqtSignal(list)
+    pinned_chunk_loaded = pyqtSignal(list)
+    images_chunk_loaded = pyqtSignal(list)
+    indexes_loaded = pyqtSignal(object, object)
+
+    def __init__(self, journal, store, blob_store, thumbnail_cache, max_size, chunk_size=200,
+                 image_chunk_size=50):
+        super().__init__()
+        self.journal = journal
+        self.store = store
+        self.blob_store = blob_store
+        self.thumbnail_cache = thumbnail_cache
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.image_chunk_size = image_chunk_size
+
+    def run(self):
+        history, pinned = self.journal.load(self.max_size)
+
+        for chunk in self._chunks(list(pinned.items()), self.chunk_size):
+            self.pinned_chunk_loaded.emit(chunk)
+        for chunk in self._chunks(list(history.items()), self.chunk_size):
+            self.history_chunk_loaded.emit(chunk)
+
+        images = self.store.load_images()
+        for chunk in self._chunks(images, self.image_chunk_size):
+            self.images_chunk_loaded.emit([self.prepare_image(entry) for entry in chunk])
+
+        self.indexes_loaded.emit(TrigramIndex(history), TrigramIndex(pinned))
+
+    def prepare_image(self, entry):
+        has_thumbnail = self.thumbnail_cache.contains(entry.image_id)
+        if entry.phash is not None and has_thumbnail:
+            return entry
+
+        image = QImage(self.blob_store.path(entry.image_id))
+        if image.isNull():
+            return entry
+        if not has_thumbnail:
+            self.thumbnail_cache.store(entry.image_id, make_thumbnail(image))
+        if entry.phash is None:
+            entry = entry._replace(phash=dhash(image))
+            self.store.set_image_phash(entry.image_id, entry.phash)
+        return entry
+
+    @staticmethod
+    def _chunks(items, size):
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from src.core.history_events import HistoryChange
+
+DISPLAY_LENGTH = 50
+DISPLAY_CACHE_SIZE = 4096
+
+
+class HistoryListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        self._display_cache = OrderedDict()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+
+        entry_id, text = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f'{index.row() + 1}. {self._display_text(entry_id, text)}'
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return text[:500]
+        if role == Qt.ItemDataRole.UserRole:
+            return text
+        return None
+
+    def text(self, row):
+        if 0 <= row < len(self.entries):
+            return self.entries[row][1]
+        return ''
+
+    def apply_changes(self, changes):
+        for change in changes:
+            if change.kind == HistoryChange.RESET:
+                self.beginResetModel()
+                self.entries = list(change.entries)
+                self._display_cache.clear()
+                self.endResetModel()
+            elif change.kind == HistoryChange.INSERT:
+                if not change.entries:
+                    continue
+                last = change.row + len(change.entries) - 1
+                self.beginInsertRows(QModelIndex(), change.row, last)
+                self.entries[change.row:change.row] = change.entries
+                self.endInsertRows()
+                self._renumber_from(last + 1)
+            elif change.kind == HistoryChange.REMOVE:
+                self.beginRemoveRows(QModelIndex(), change.row, change.row)
+                entry_id, text = self.entries.pop(change.row)
+                self._display_cache.pop(entry_id, None)
+                self.endRemoveRows()
+                self._renumber_from(change.row)
+            elif change.kind == HistoryChange.MOVE:
+                self._move(change.row, change.new_row)
+            elif change.kind == HistoryChange.UPDATE:
+                self.entries[change.row] = change.entries[0]
+                self._display_cache.pop(change.entry_id, None)
+                index = self.index(change.row)
+                self.dataChanged.emit(index, index)
+
+    def _move(self, row, new_row):
+        if row == new_row:
+            return
+        destination = new_row if new_row < row else new_row + 1
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination)
+        self.entries.insert(new_row, self.entries.pop(row))
+        self.endMoveRows()
+        self._renumber_from(min(row, new_row))
+
+    def _renumber_from(self, row):
+        if row < len(self.entries):
+            self.dataChanged.emit(self.index(row), self.index(len(self.entries) - 1),
+                                  [Qt.ItemDataRole.DisplayRole])
+
+    def _display_text(self, entry_id, text):
+        display_text = self._display_cache.get(entry_id)
+        if display_text is not None:
+            self._display_cache.move_to_end(entry_id)
+            return display_text
+
+        first_line = text[:DISPLAY_LENGTH * 4].replace('\n', ' ')
+        if len(text) > DISPLAY_LENGTH:
+            display_text = first_line[:DISPLAY_LENGTH] + '...'
+        else:
+            display_text = first_line
+        self._display_cache[entry_id] = display_text
+        if len(self._display_cache) > DISPLAY_CACHE_SIZE:
+            self._display_cache.popitem(last=False)
+        return display_text
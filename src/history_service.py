@@ -1,101 +1,171 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+import functools
+from PyQt6.QtCore import QCoreApplication, QObject, pyqtSignal
+from src.core.history_engine import HistoryEngine
+from src.history_loader import HistoryLoader
 from src.image_service import ImageService
+from src.search_pipeline import SearchPipeline
+
+
+def after_load(method):
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if not self.loaded:
+            self._deferred_calls.append(functools.partial(method, self, *args))
+            return None
+        return method(self, *args)
+    return wrapper
+
 
 class HistoryService(QObject):
-    history_updated = pyqtSignal(list)
-    pinned_history_updated = pyqtSignal(list)
-    images_updated = pyqtSignal(list)
+    history_changed = pyqtSignal(list)
+    pinned_history_changed = pyqtSignal(list)
+    images_changed = pyqtSignal(list)
+    thumbnail_ready = pyqtSignal(str)
+    loading_finished = pyqtSignal()
+    search_failed = pyqtSignal(str)
 
     def __init__(self, settings_manager):
         super().__init__()
         self.settings = settings_manager
 
-        self.full_history = settings_manager.get('history')
-        self.filtered_history = self.full_history.copy()
-        self.max_size = settings_manager.get('max_history_size')
+        self.engine = HistoryEngine(settings_manager)
+        self.engine.history_changed.connect(self.history_changed.emit)
+        self.engine.pinned_history_changed.connect(self.pinned_history_changed.emit)
+        self.engine.search_requested.connect(self._submit_search)
+        self.engine.search_failed.connect(self.search_failed.emit)
 
-        self.full_pinned_history = settings_manager.get('pinned_history')
-        self.filtered_pinned_history = self.full_pinned_history.copy()
-        self.current_filter = ''
+        self.search_pipeline = SearchPipeline()
+        self.search_pipeline.results_ready.connect(self._on_search_results)
+        self.search_pipeline.search_failed.connect(self.search_failed)
 
-        self.image_service = ImageService(settings_manager)
-        self.image_service.images_updated.connect(self.images_updated)
+        self.loaded = False
+        self._deferred_calls = []
+        self.loader = None
 
+        self.image_service = ImageService(settings_manager)
+        self.image_service.images_changed.connect(self.images_changed)
+        self.image_service.thumbnail_ready.connect(self.thumbnail_ready)
+
+    def load_async(self):
+        self.loader = HistoryLoader(self.engine.journal, self.settings.store,
+                                    self.settings.blob_store, self.image_service.thumbnail_cache,
+                                    self.engine.max_size)
+        self.loader.history_chunk_loaded.connect(self.engine.append_loaded_history)
+        self.loader.pinned_chunk_loaded.connect(self.engine.append_loaded_pinned)
+        self.loader.images_chunk_loaded.connect(self._on_images_chunk_loaded)
+        self.loader.indexes_loaded.connect(self.engine.set_indexes)
+        self.loader.finished.connect(self._on_loading_finished)
+        self.loader.start()
+
+    def _on_images_chunk_loaded(self, entries):
+        self.image_service.append_loaded_images(entries)
+
+    def _on_loading_finished(self):
+        self.loaded = True
+        self.loader = None
+
+        deferred_calls, self._deferred_calls = self._deferred_calls, []
+        for call in deferred_calls:
+            call()
+
+        if self.engine.current_filter:
+            self.filter_items(self.engine.current_filter)
+        self.loading_finished.emit()
+
+    @after_load
     def add_to_history(self, text):
-        if text and text not in self.full_history:
-            new_history = [text] + self.full_history
-            if len(new_history) > self.max_size:
-                new_history = new_history[:self.max_size]
-            self._update_history(new_history)
+        self.engine.add_to_history(text)
 
+    @after_load
+    def remove_from_history(self, text):
+        self.engine.remove_from_history(text)
+
+    @after_load
     def pin_current_item(self):
-        if self.full_history:
-            item_to_pin = self.full_history[0]
-            self.pin_text(item_to_pin)
+        self.engine.pin_current_item()
 
+    @after_load
     def pin_text(self, text):
-        if text and text not in self.full_pinned_history:
-            new_pinned_history = [text] + self.full_pinned_history
-            self._update_pinned_history(new_pinned_history)
+        self.engine.pin_text(text)
 
+    @after_load
     def remove_pinned(self, text):
-        if text and self.full_pinned_history:
-            new_pinned_history = [item for item in self.full_pinned_history if item != text]
-            self._update_pinned_history(new_pinned_history)
+        self.engine.remove_pinned(text)
 
+    @after_load
     def update_max_size(self, new_size):
-        self.max_size = new_size
-        if len(self.full_history) > self.max_size:
-            self._update_history(self.full_history[:self.max_size])
-
-    def filter_items(self, filter_text):
-        self.current_filter = filter_text.lower().strip()
-
-        self.filtered_history = self.full_history if not self.current_filter else [
-            text for text in self.full_history
-            if self.current_filter in text.lower()
-        ]
-
-        self.filtered_pinned_history = self.full_pinned_history if not self.current_filter else [
-            text for text in self.full_pinned_history
-            if self.current_filter in text.lower()
-        ]
-
-        self.history_updated.emit(self.filtered_history)
-        self.pinned_history_updated.emit(self.filtered_pinned_history)
-
-    def _update_history(self, history):
-        self.full_history = history
-        self.filtered_history = history[:]
-        self.settings.set('history', history)
-        self.history_updated.emit(history)
-
-    def _update_pinned_history(self, pinned_history):
-        self.full_pinned_history = pinned_history
-        self.filtered_pinned_history = pinned_history[:]
-        self.settings.set('pinned_history', pinned_history)
-        self.pinned_history_updated.emit(pinned_history)
+        self.engine.update_max_size(new_size)
+
+    def get_history_item(self, index):
+        return self.engine.get_history_item(index)
+
+    def get_pinned_item(self, index):
+        return self.engine.get_pinned_item(index)
+
+    def set_search_mode(self, mode):
+        self.engine.set_search_mode(mode)
 
+    def filter_items(self, filter_text, mode=None):
+        if not filter_text.strip():
+            self.search_pipeline.cancel()
+        self.engine.filter_items(filter_text, mode)
+
+    def _submit_search(self, prepare):
+        self.search_pipeline.submit(prepare)
+
+    def _on_search_results(self, generation, result):
+        self.engine.apply_search_results(result)
+
+    def flush(self):
+        if self.loader is not None:
+            self.loader.wait()
+            QCoreApplication.sendPostedEvents()
+            if not self.loaded:
+                self._on_loading_finished()
+
+        self.search_pipeline.cancel()
+        self.search_pipeline.wait()
+        self.image_service.flush()
+        self.engine.flush()
+
+    @after_load
     def clear_history(self):
-        self._update_history([])
+        self.engine.clear_history()
 
+    @after_load
     def clear_pinned_history(self):
-        self._update_pinned_history([])
+        self.engine.clear_pinned_history()
 
-    def add_image(self, pixmap):
-        return self.image_service.add_image(pixmap)
+    @after_load
+    def add_image(self, image, image_id=None):
+        return self.image_service.add_image(image, image_id)
 
-    def remove_image(self, image_base64):
-        return self.image_service.remove_image(image_base64)
+    @after_load
+    def remove_image(self, image_id):
+        return self.image_service.remove_image(image_id)
 
+    @after_load
     def clear_images(self):
         self.image_service.clear_images()
 
-    def update_max_images_size(self, new_size):
-        self.image_service.update_max_size(new_size)
+    @after_load
+    def update_images_budget(self, max_bytes):
+        self.image_service.update_budget(max_bytes)
+
+    def get_image(self, image_id):
+        return self.image_service.get_image(image_id)
+
+    def get_image_thumbnail(self, image_id):
+        return self.image_service.get_image_thumbnail(image_id)
+
+    def cancel_thumbnail_requests(self):
+        self.image_service.cancel_thumbnail_requests()
+
+    def is_near_duplicate(self, image_id):
+        return self.image_service.is_near_duplicate(image_id)
 
-    def get_image_pixmap(self, image_base64):
-        return self.image_service.get_image_pixmap(image_base64)
+    def image_row(self, image_id):
+        return self.image_service.image_row(image_id)
 
     def get_images(self):
-        return self.image_service.images
\ No newline at end of file
+        return self.image_service.images
@@ -1,16 +1,18 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QMenu
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QMenu, QAbstractItemView
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QAction
+from src.history_model import HistoryListModel
 
 
 class HistoryTabWidget(QWidget):
     paste_requested = pyqtSignal(str)
+    paste_many_requested = pyqtSignal(list)
     context_menu_requested = pyqtSignal(str, str)
 
     def __init__(self, tab_type='main'):
         super().__init__()
         self.tab_type = tab_type
-        self.full_history = []
+        self.model = HistoryListModel(self)
         self.setup_ui()
 
     def setup_ui(self):
@@ -23,61 +25,71 @@ class HistoryTabWidget(QWidget):
             self.setup_empty_tab(layout)
 
     def setup_main_tab(self, layout):
-        self.history_list = QListWidget()
-        self.history_list.itemDoubleClicked.connect(
-            lambda item: self.paste_requested.emit(self.get_item_text(item))
-        )
-        self.history_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.history_list.customContextMenuRequested.connect(self.show_context_menu)
+        self.history_list = self.create_list_view()
         layout.addWidget(self.history_list)
-
-        self.full_history = []
         self.context_menu = None
 
     def setup_pin_tab(self, layout):
-        self.pinned_history_list = QListWidget()
-        self.pinned_history_list.itemDoubleClicked.connect(
-            lambda item: self.paste_requested.emit(self.get_item_text(item))
-        )
-        self.pinned_history_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.pinned_history_list.customContextMenuRequested.connect(self.show_context_menu)
+        self.pinned_history_list = self.create_list_view()
         layout.addWidget(self.pinned_history_list)
-
-        self.full_history = []
         self.context_menu = None
 
+    def create_list_view(self):
+        list_view = QListView()
+        list_view.setModel(self.model)
+        list_view.setUniformItemSizes(True)
+        list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        list_view.setBatchSize(200)
+        list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        list_view.doubleClicked.connect(
+            lambda index: self.paste_requested.emit(self.get_item_text(index))
+        )
+        list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        list_view.customContextMenuRequested.connect(self.show_context_menu)
+        return list_view
+
     def setup_empty_tab(self, layout):
         layout.addWidget(QLabel('Пустая вкладка'))
 
-    def get_item_text(self, item):
-        if hasattr(self, 'full_history') and self.full_history:
-            if hasattr(self, 'history_list') and item.listWidget() == self.history_list:
-                return self.full_history[self.history_list.row(item)]
-            elif hasattr(self, 'pinned_history_list') and item.listWidget() == self.pinned_history_list:
-                return self.full_history[self.pinned_history_list.row(item)]
-        return ''
+    def get_item_text(self, index):
+        if index is None or not index.isValid():
+            return ''
+        return self.model.text(index.row())
 
-    def show_context_menu(self, position):
-        if self.tab_type == 'main' and hasattr(self, 'history_list'):
-            widget = self.history_list
-            items = self.history_list.selectedItems()
-        elif self.tab_type == 'pin' and hasattr(self, 'pinned_history_list'):
-            widget = self.pinned_history_list
-            items = self.pinned_history_list.selectedItems()
-        else:
-            return
+    def get_selected_text(self):
+        selected_texts = self.get_selected_texts()
+        return selected_texts[0] if selected_texts else None
 
-        if not items:
+    def get_selected_texts(self):
+        list_view = self.get_list_widget()
+        if list_view is None:
+            return []
+        selected = sorted(list_view.selectionModel().selectedIndexes(),
+                          key=lambda index: index.row())
+        return [text for text in map(self.get_item_text, selected) if text]
+
+    def show_context_menu(self, position):
+        widget = self.get_list_widget()
+        if widget is None:
             return
 
-        selected_item = items[0]
-        selected_text = self.get_item_text(selected_item)
+        selected_text = self.get_item_text(widget.indexAt(position))
 
         if not selected_text:
             return
 
         self.context_menu = QMenu(self)
 
+        selected_texts = self.get_selected_texts()
+        if len(selected_texts) > 1:
+            paste_many_action = QAction(f"Вставить выбранные ({len(selected_texts)})", self)
+            paste_many_action.triggered.connect(
+                lambda: self.paste_many_requested.emit(selected_texts)
+            )
+            self.context_menu.addAction(paste_many_action)
+            self.context_menu.addSeparator()
+
         if self.tab_type == 'main':
             pin_action = QAction("Закрепить", self)
             pin_action.triggered.connect(
@@ -100,16 +112,12 @@ class HistoryTabWidget(QWidget):
 
         self.context_menu.exec(widget.mapToGlobal(position))
 
-    def update_history(self, history):
-        self.full_history = history.copy()
+    def get_list_widget(self):
         if self.tab_type == 'main' and hasattr(self, 'history_list'):
-            self.history_list.clear()
-            for i, text in enumerate(history, 1):
-                display_text = text[:50] + '...' if len(text) > 50 else text
-                self.history_list.addItem(f'{i}. {display_text}')
-
+            return self.history_list
         elif self.tab_type == 'pin' and hasattr(self, 'pinned_history_list'):
-            self.pinned_history_list.clear()
-            for i, text in enumerate(history, 1):
-                display_text = text[:50] + '...' if len(text) > 50 else text
-                self.pinned_history_list.addItem(f'{i}. {display_text}')
\ No newline at end of file
+            return self.pinned_history_list
+        return None
+
+    def apply_changes(self, changes):
+        self.model.apply_changes(changes)
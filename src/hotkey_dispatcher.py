@@ -0,0 +1,62 @@
+import keyboard, logging, queue, time
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger('clipmate.hotkeys')
+
+
+class HotkeyDispatcher(QObject):
+    _wakeup = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._events = queue.SimpleQueue()
+        self._bindings = {}
+        self._wakeup.connect(self._drain)
+
+    def bind(self, name, sequence, handler):
+        self.unbind(name)
+        if not sequence:
+            return False
+
+        try:
+            handle = keyboard.add_hotkey(sequence, lambda: self._enqueue(name))
+        except (ValueError, ImportError, OSError) as error:
+            logger.warning('cannot bind %s to %r: %s', name, sequence, error)
+            return False
+
+        self._bindings[name] = (sequence, handle, handler)
+        return True
+
+    def unbind(self, name):
+        binding = self._bindings.pop(name, None)
+        if binding is None:
+            return
+        try:
+            keyboard.remove_hotkey(binding[1])
+        except (KeyError, ValueError):
+            pass
+
+    def sequence(self, name):
+        binding = self._bindings.get(name)
+        return binding[0] if binding else None
+
+    def clear(self):
+        for name in list(self._bindings):
+            self.unbind(name)
+
+    def _enqueue(self, name):
+        self._events.put((name, time.perf_counter()))
+        self._wakeup.emit()
+
+    def _drain(self):
+        while True:
+            try:
+                name, pressed_at = self._events.get_nowait()
+            except queue.Empty:
+                return
+
+            binding = self._bindings.get(name)
+            if binding is None:
+                continue
+
+            binding[2](pressed_at)
@@ -0,0 +1,106 @@
+import math
+from collections import namedtuple
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt6.QtGui import QImage
+from src.core.settings import MEGABYTE
+
+EncodedImage = namedtuple('EncodedImage', 'data width height format')
+
+SAMPLE_SIZE = 64
+PHOTO_COLOR_RATIO = 0.5
+PNG_QUALITY = 50
+JPEG_QUALITIES = (85, 75, 60)
+MIN_SIDE = 64
+
+
+def encode(image, image_format, quality=-1):
+    byte_array = QByteArray()
+    buffer = QBuffer(byte_array)
+    if not buffer.open(QIODevice.OpenModeFlag.WriteOnly):
+        return None
+
+    success = image.save(buffer, image_format, quality)
+    buffer.close()
+
+    if not success or byte_array.isEmpty():
+        return None
+    return byte_array.data()
+
+
+def sample_pixels(image):
+    sample = image.scaled(SAMPLE_SIZE, SAMPLE_SIZE,
+                          Qt.AspectRatioMode.IgnoreAspectRatio,
+                          Qt.TransformationMode.FastTransformation)
+    sample = sample.convertToFormat(QImage.Format.Format_ARGB32)
+
+    bits = sample.constBits()
+    bits.setsize(sample.sizeInBytes())
+    return bytes(bits)
+
+
+def has_transparency(image, data):
+    return image.hasAlphaChannel() and any(alpha != 255 for alpha in data[3::4])
+
+
+def is_photographic(data):
+    colors = {data[i:i + 3] for i in range(0, len(data), 4)}
+    return len(colors) > SAMPLE_SIZE * SAMPLE_SIZE * PHOTO_COLOR_RATIO
+
+
+class EncoderPolicy:
+    def __init__(self, max_bytes=4 * MEGABYTE, max_pixels=12_000_000, keep_original=False):
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.keep_original = keep_original
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get('max_image_bytes', 4 * MEGABYTE),
+                   settings.get('max_image_pixels', 12_000_000),
+                   settings.get('image_keep_original', False))
+
+    def encode(self, image):
+        if image.isNull():
+            return None
+        if self.keep_original:
+            return self._result(image, 'PNG', encode(image, 'PNG', PNG_QUALITY))
+
+        image = self._fit_pixels(image)
+        sample = sample_pixels(image)
+        lossy = not has_transparency(image, sample) and is_photographic(sample)
+
+        while True:
+            if lossy:
+                for quality in JPEG_QUALITIES:
+                    data = encode(image, 'JPEG', quality)
+                    if data is None or len(data) <= self.max_bytes:
+                        break
+                result = self._result(image, 'JPEG', data)
+            else:
+                result = self._result(image, 'PNG', encode(image, 'PNG', PNG_QUALITY))
+
+            if result is None or len(result.data) <= self.max_bytes:
+                return result
+
+            scale = math.sqrt(self.max_bytes / len(result.data)) * 0.9
+            width, height = int(image.width() * scale), int(image.height() * scale)
+            if min(width, height) < MIN_SIDE:
+                return result
+            image = image.scaled(width, height,
+                                 Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+
+    def _fit_pixels(self, image):
+        pixels = image.width() * image.height()
+        if not self.max_pixels or pixels <= self.max_pixels:
+            return image
+        scale = math.sqrt(self.max_pixels / pixels)
+        return image.scaled(int(image.width() * scale), int(image.height() * scale),
+                            Qt.AspectRatioMode.KeepAspectRatio,
+                            Qt.TransformationMode.SmoothTransformation)
+
+    @staticmethod
+    def _result(image, image_format, data):
+        if not data:
+            return None
+        return EncodedImage(data, image.width(), image.height(), image_format)
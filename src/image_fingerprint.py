@@ -0,0 +1,45 @@
+import hashlib, struct
+from PyQt6.QtGui import QImage
+from src.core.blob_store import BlobStore
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+CANONICAL_FORMATS = (QImage.Format.Format_ARGB32, QImage.Format.Format_RGB32)
+
+
+def _hasher():
+    if xxhash is not None:
+        return 'xxh3', xxhash.xxh3_128()
+    return 'b2', hashlib.blake2b(digest_size=16)
+
+
+def image_fingerprint(image):
+    if image is None or image.isNull():
+        return None
+    if image.format() not in CANONICAL_FORMATS:
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+
+    width, height = image.width(), image.height()
+    bytes_per_line = image.bytesPerLine()
+    row_bytes = width * 4
+
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    buffer = memoryview(bits)
+
+    name, hasher = _hasher()
+    hasher.update(struct.pack('<II', width, height))
+    if row_bytes == bytes_per_line:
+        hasher.update(buffer[:row_bytes * height])
+    else:
+        for offset in range(0, bytes_per_line * height, bytes_per_line):
+            hasher.update(buffer[offset:offset + row_bytes])
+
+    return f'{name}-{hasher.hexdigest()}'
+
+
+def data_fingerprint(data):
+    return image_fingerprint(QImage.fromData(data)) or BlobStore.digest(data)
@@ -0,0 +1,88 @@
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor, QPixmap
+from src.core.history_events import HistoryChange
+from src.thumbnail_cache import THUMBNAIL_SIZE
+
+
+class ImageGalleryModel(QAbstractListModel):
+    def __init__(self, thumbnail_provider, is_near_duplicate=None, row_of=None, parent=None):
+        super().__init__(parent)
+        self.thumbnail_provider = thumbnail_provider
+        self.is_near_duplicate = is_near_duplicate or (lambda image_id: False)
+        self.row_of = row_of or self._scan_row
+        self.entries = []
+        self._placeholder = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+
+        image_id, entry = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            text = f'Изображение {index.row() + 1} ({entry.width}x{entry.height})'
+            if self.is_near_duplicate(image_id):
+                text = f'{text} — похоже на предыдущее'
+            return text
+        if role == Qt.ItemDataRole.DecorationRole:
+            thumbnail = self.thumbnail_provider(image_id)
+            return thumbnail if thumbnail is not None else self.placeholder()
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f'Размер: {entry.width}x{entry.height}\nДвойной клик для вставки'
+        if role == Qt.ItemDataRole.UserRole:
+            return image_id
+        return None
+
+    def image_id(self, row):
+        if 0 <= row < len(self.entries):
+            return self.entries[row][0]
+        return None
+
+    def placeholder(self):
+        if self._placeholder is None:
+            self._placeholder = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+            self._placeholder.fill(QColor(128, 128, 128, 40))
+        return self._placeholder
+
+    def on_thumbnail_ready(self, image_id):
+        row = self.row_of(image_id)
+        if row is not None and self.image_id(row) == image_id:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def _scan_row(self, image_id):
+        for row, (entry_id, entry) in enumerate(self.entries):
+            if entry_id == image_id:
+                return row
+        return None
+
+    def apply_changes(self, changes):
+        for change in changes:
+            if change.kind == HistoryChange.RESET:
+                self.beginResetModel()
+                self.entries = list(change.entries)
+                self.endResetModel()
+            elif change.kind == HistoryChange.INSERT:
+                if not change.entries:
+                    continue
+                last = change.row + len(change.entries) - 1
+                self.beginInsertRows(QModelIndex(), change.row, last)
+                self.entries[change.row:change.row] = change.entries
+                self.endInsertRows()
+                self._renumber_from(last + 1)
+            elif change.kind == HistoryChange.REMOVE:
+                self.beginRemoveRows(QModelIndex(), change.row, change.row)
+                del self.entries[change.row]
+                self.endRemoveRows()
+                self._renumber_from(change.row)
+            elif change.kind == HistoryChange.UPDATE:
+                self.entries[change.row] = change.entries[0]
+                index = self.index(change.row)
+                self.dataChanged.emit(index, index)
+
+    def _renumber_from(self, row):
+        if row < len(self.entries):
+            self.dataChanged.emit(self.index(row), self.index(len(self.entries) - 1),
+                                  [Qt.ItemDataRole.DisplayRole])
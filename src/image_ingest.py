@@ -0,0 +1,89 @@
+import threading, time
+from collections import namedtuple
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from src.core.history_store import ImageEntry
+from src.image_fingerprint import image_fingerprint
+from src.perceptual_hash import dhash
+from src.thumbnail_cache import make_thumbnail
+
+IngestResult = namedtuple('IngestResult', 'entry thumbnail')
+
+
+class IngestJob(QRunnable):
+    def __init__(self, pipeline, sequence, image, policy, image_id=None):
+        super().__init__()
+        self.pipeline = pipeline
+        self.sequence = sequence
+        self.image = image
+        self.policy = policy
+        self.image_id = image_id
+
+    def run(self):
+        try:
+            result = self.ingest()
+        except Exception:
+            result = None
+        self.pipeline.complete(self.sequence, result)
+
+    def ingest(self):
+        image_id = self.image_id or image_fingerprint(self.image)
+        if not image_id or self.pipeline.is_known(image_id):
+            return None
+
+        encoded = self.policy.encode(self.image)
+        if encoded is None:
+            return None
+
+        self.pipeline.blob_store.put(encoded.data, image_id)
+        entry = ImageEntry(image_id, encoded.width, encoded.height,
+                           len(encoded.data), time.time(), dhash(self.image))
+        thumbnail = make_thumbnail(self.image)
+        self.pipeline.thumbnail_cache.store(image_id, thumbnail)
+        return IngestResult(entry, thumbnail)
+
+
+class ImageIngestPipeline(QObject):
+    job_finished = pyqtSignal()
+    image_ready = pyqtSignal(object)
+
+    def __init__(self, blob_store, thumbnail_cache, is_known, max_workers=2):
+        super().__init__()
+        self.blob_store = blob_store
+        self.thumbnail_cache = thumbnail_cache
+        self.is_known = is_known
+
+        self._pool = QThreadPool()
+        ideal_workers = QThreadPool.globalInstance().maxThreadCount()
+        self._pool.setMaxThreadCount(max(1, min(max_workers, ideal_workers)))
+
+        self._lock = threading.Lock()
+        self._results = {}
+        self._next_sequence = 0
+        self._submitted = 0
+
+        self.job_finished.connect(self._drain)
+
+    def submit(self, image, policy, image_id=None):
+        sequence = self._submitted
+        self._submitted += 1
+        self._pool.start(IngestJob(self, sequence, image, policy, image_id))
+        return sequence
+
+    def complete(self, sequence, result):
+        with self._lock:
+            self._results[sequence] = result
+        self.job_finished.emit()
+
+    def flush(self):
+        self._pool.waitForDone()
+        self._drain()
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if self._next_sequence not in self._results:
+                    return
+                result = self._results.pop(self._next_sequence)
+                self._next_sequence += 1
+            if result is not None:
+                self.image_ready.emit(result)
@@ -1,87 +1,126 @@
-import base64
-from PyQt6.QtCore import QObject, pyqtSignal, QBuffer, QByteArray, QIODevice
-from PyQt6.QtGui import QPixmap
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from src.core.image_library import ImageLibrary
+from src.core.settings import MEGABYTE
+from src.image_encoder import EncoderPolicy
+from src.image_ingest import ImageIngestPipeline
+from src.thumbnail_cache import ThumbnailCache, ThumbnailLoader
+
+DECODED_CACHE_SIZE = 8
+DECODED_CACHE_BYTES = 256 * MEGABYTE
 
 class ImageService(QObject):
-    images_updated = pyqtSignal(list)
+    images_changed = pyqtSignal(list)
+    thumbnail_ready = pyqtSignal(str)
 
     def __init__(self, settings_manager):
         super().__init__()
         self.settings = settings_manager
-
-        self.images = settings_manager.get('images')
-        self.max_size = settings_manager.get('max_images_size')
-
-    def add_image(self, pixmap):
-        image_base64 = self.pixmap_to_base64(pixmap)
-        if image_base64 and image_base64 not in self.images:
-            new_images = [image_base64] + self.images
-            if len(new_images) > self.max_size:
-                new_images = new_images[:self.max_size]
-            self._update_images(new_images)
-            return True
-        return False
-
-    def remove_image(self, image_base64):
-        if image_base64 in self.images:
-            new_images = [img for img in self.images if img != image_base64]
-            self._update_images(new_images)
-            return True
-        return False
+        self.store = settings_manager.store
+        self.blob_store = settings_manager.blob_store
+
+        self.library = ImageLibrary(settings_manager)
+        self.thumbnail_cache = ThumbnailCache(settings_manager.thumbnail_dir)
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_cache, self.blob_store)
+        self.thumbnail_loader.thumbnail_ready.connect(self.thumbnail_ready)
+        self.decoded_images = OrderedDict()
+        self.ingest = ImageIngestPipeline(self.blob_store, self.thumbnail_cache,
+                                          self.library.__contains__)
+        self.ingest.image_ready.connect(self._on_image_ready)
+
+    @property
+    def images(self):
+        return self.library.images
+
+    def append_loaded_images(self, entries):
+        self.images_changed.emit([self.library.append(entries)])
+
+    def add_image(self, image, image_id=None):
+        if image.isNull() or (image_id and image_id in self.library):
+            return False
+        self.ingest.submit(image, EncoderPolicy.from_settings(self.settings), image_id)
+        return True
+
+    def _on_image_ready(self, result):
+        entry = result.entry
+        if entry.image_id in self.library:
+            return
+
+        changes = self._drop_images(self.library.superseded_by(entry))
+        self.store.add_image(entry)
+        self.thumbnail_cache.put(entry.image_id, QPixmap.fromImage(result.thumbnail))
+        changes.append(self.library.insert(entry))
+        changes.extend(self._drop_images(self.library.over_budget()))
+        self.images_changed.emit(changes)
+
+    def is_near_duplicate(self, image_id):
+        return self.library.is_near_duplicate(image_id)
+
+    def image_row(self, image_id):
+        return self.library.row(image_id)
+
+    def flush(self):
+        self.thumbnail_loader.cancel_pending()
+        self.thumbnail_loader.wait()
+        self.ingest.flush()
+
+    def remove_image(self, image_id):
+        entry = self.library.get(image_id)
+        if entry is None:
+            return False
+        self.images_changed.emit(self._drop_images([entry]))
+        return True
 
     def clear_images(self):
-        self._update_images([])
-
-    def update_max_size(self, new_size):
-        self.max_size = new_size
-        if len(self.images) > self.max_size:
-            self.images = self.images[:self.max_size]
-            self._update_images(self.images)
-
-    def get_image_pixmap(self, image_base64):
-        return self.base64_to_pixmap(image_base64)
-
-    def _update_images(self, images):
-        self.images = images
-        self.settings.set('images', images)
-        self.images_updated.emit(images)
-
-    @staticmethod
-    def pixmap_to_base64(pixmap):
-        if pixmap.isNull():
-            return None
-
-        try:
-            byte_array = QByteArray()
-            buffer = QBuffer(byte_array)
-
-            if not buffer.open(QIODevice.OpenModeFlag.WriteOnly):
-                return None
-
-            success = pixmap.save(buffer, "PNG", quality=100)
-            buffer.close()
-
-            if not success:
-                return None
-
-            if byte_array.isEmpty():
-                return None
-
-            base64_data = base64.b64encode(byte_array.data()).decode('utf-8')
-            return f'data:image/png;base64,{base64_data}'
-
-        except Exception:
+        self.store.clear_images()
+        for entry in self.library.images:
+            self.blob_store.remove(entry.image_id)
+        self.thumbnail_cache.clear()
+        self.decoded_images.clear()
+        self.images_changed.emit([self.library.clear()])
+
+    def update_budget(self, max_bytes):
+        self.library.max_bytes = max_bytes
+        over_budget = self.library.over_budget()
+        if over_budget:
+            self.images_changed.emit(self._drop_images(over_budget))
+
+    def get_image(self, image_id):
+        image = self.decoded_images.get(image_id)
+        if image is not None:
+            self.decoded_images.move_to_end(image_id)
+            return image
+
+        image = QImage()
+        if image_id in self.library and image.load(self.blob_store.path(image_id)):
+            self.decoded_images[image_id] = image
+            self._trim_decoded_images()
+        return image
+
+    def _trim_decoded_images(self):
+        total = sum(image.sizeInBytes() for image in self.decoded_images.values())
+        while len(self.decoded_images) > 1 and (
+                len(self.decoded_images) > DECODED_CACHE_SIZE or total > DECODED_CACHE_BYTES):
+            image_id, image = self.decoded_images.popitem(last=False)
+            total -= image.sizeInBytes()
+
+    def get_image_thumbnail(self, image_id):
+        if image_id not in self.library:
             return None
-
-    @staticmethod
-    def base64_to_pixmap(base64_str):
-        try:
-            if ',' in base64_str:
-                base64_str = base64_str.split(',')[1]
-
-            image_data = base64.b64decode(base64_str)
-            pixmap = QPixmap()
-            pixmap.loadFromData(image_data)
-            return pixmap
-        except Exception:
-            return QPixmap()
\ No newline at end of file
+        thumbnail = self.thumbnail_cache.peek(image_id)
+        if thumbnail is None:
+            self.thumbnail_loader.request(image_id)
+        return thumbnail
+
+    def cancel_thumbnail_requests(self):
+        self.thumbnail_loader.cancel_pending()
+
+    def _drop_images(self, entries):
+        for entry in entries:
+            self.store.remove_image(entry.image_id)
+            self.blob_store.remove(entry.image_id)
+            self.thumbnail_cache.remove(entry.image_id)
+            self.thumbnail_loader.forget(entry.image_id)
+            self.decoded_images.pop(entry.image_id, None)
+        return self.library.remove(entries)
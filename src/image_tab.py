@@ -1,25 +1,31 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QHBoxLayout,
-                             QPushButton, QLabel)
-from PyQt6.QtCore import pyqtSignal, Qt, QSize
-from PyQt6.QtGui import QPixmap, QIcon
-import base64
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListView, QHBoxLayout, QPushButton,
+                             QAbstractItemView)
+from PyQt6.QtCore import pyqtSignal, QSize
+from src.image_gallery_model import ImageGalleryModel
+from src.thumbnail_cache import THUMBNAIL_SIZE
 
 class ImageTabWidget(QWidget):
     paste_requested = pyqtSignal(str)
     remove_requested = pyqtSignal(str)
+    viewport_changed = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, thumbnail_provider, is_near_duplicate=None, row_of=None):
         super().__init__()
-        self.images = []
+        self.model = ImageGalleryModel(thumbnail_provider, is_near_duplicate, row_of, self)
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        self.images_list = QListWidget()
-        self.images_list.itemDoubleClicked.connect(self._on_item_double_clicked)
-        self.images_list.setIconSize(QSize(100, 100))
+        self.images_list = QListView()
+        self.images_list.setModel(self.model)
+        self.images_list.setUniformItemSizes(True)
+        self.images_list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.images_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.images_list.doubleClicked.connect(self._on_item_double_clicked)
+        self.images_list.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
         self.images_list.setSpacing(5)
+        self.images_list.verticalScrollBar().valueChanged.connect(self._on_scrolled)
         layout.addWidget(self.images_list)
 
         button_layout = QHBoxLayout()
@@ -34,9 +40,14 @@ class ImageTabWidget(QWidget):
 
         layout.addLayout(button_layout)
 
-    def _on_item_double_clicked(self, item):
-        if hasattr(item, 'image_data'):
-            self.paste_requested.emit(item.image_data)
+    def _on_scrolled(self):
+        self.viewport_changed.emit()
+        self.images_list.viewport().update()
+
+    def _on_item_double_clicked(self, index):
+        image_id = self.model.image_id(index.row())
+        if image_id:
+            self.paste_requested.emit(image_id)
 
     def _on_paste_clicked(self):
         selected_image = self.get_selected_image()
@@ -48,50 +59,14 @@ class ImageTabWidget(QWidget):
         if selected_image:
             self.remove_requested.emit(selected_image)
 
-    def update_images(self, images_base64):
-        self.images = images_base64
-        self.images_list.clear()
-
-        for i, image_base64 in enumerate(images_base64, 1):
-            item = QListWidgetItem(f'Изображение {i}')
-            item.image_data = image_base64
-
-            pixmap = self._base64_to_pixmap(image_base64)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(100, 100,
-                                              Qt.AspectRatioMode.KeepAspectRatio,
-                                              Qt.TransformationMode.SmoothTransformation)
-                item.setIcon(QIcon(scaled_pixmap))
-
-                size_info = f"Размер: {pixmap.width()}x{pixmap.height()}"
-                item.setToolTip(f"{size_info}\nДвойной клик для вставки")
+    def apply_changes(self, changes):
+        self.model.apply_changes(changes)
 
-                item.setText(f'Изображение {i} ({pixmap.width()}x{pixmap.height()})')
-            else:
-                item.setToolTip('Не удалось загрузить изображение')
-
-            self.images_list.addItem(item)
-
-    def _base64_to_pixmap(self, base64_str):
-        try:
-            if ',' in base64_str:
-                base64_str = base64_str.split(',')[1]
-
-            image_data = base64.b64decode(base64_str)
-            pixmap = QPixmap()
-            success = pixmap.loadFromData(image_data)
-            if not success:
-                return QPixmap()
-            return pixmap
-        except Exception:
-            return QPixmap
+    def on_thumbnail_ready(self, image_id):
+        self.model.on_thumbnail_ready(image_id)
 
     def get_selected_image(self):
-        selected_items = self.images_list.selectedItems()
-        if selected_items:
-            return selected_items[0].image_data
+        selected = self.images_list.selectionModel().selectedIndexes()
+        if selected:
+            return self.model.image_id(selected[0].row())
         return None
-
-    def clear_images(self):
-        self.images = []
-        self.images_list.clear()
\ No newline at end of file
@@ -0,0 +1,154 @@
+import itertools, logging, queue
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError
+from PyQt6.QtCore import QObject, pyqtSignal
+from src.core.ipc_server import IpcServer
+from src.core.regex_worker import RegexError
+
+logger = logging.getLogger('clipmate.ipc')
+
+CALL_TIMEOUT = 5.0
+SEARCH_LIMIT = 50
+READ_OPS = ('search', 'get')
+WORKERS = 2
+
+
+class IpcService(QObject):
+    _wakeup = pyqtSignal()
+
+    def __init__(self, clipboard_manager, socket_file):
+        super().__init__()
+        self.history_service = clipboard_manager.history_service
+        self.engine = self.history_service.engine
+        self.server = IpcServer(socket_file, self._handle)
+        self._executor = ThreadPoolExecutor(WORKERS, thread_name_prefix='ipc-worker')
+        self._calls = queue.SimpleQueue()
+        self._wakeup.connect(self._drain)
+
+        self.engine.clip_added.connect(self._on_clip_added)
+
+    def start(self):
+        if self.server.start():
+            logger.info('ipc listening on %s', self.server.path)
+
+    def stop(self):
+        self.server.stop()
+        while True:
+            try:
+                requests, future = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            future.cancel()
+
+    def _handle(self, requests, reply):
+        self._executor.submit(self._run_batch, requests, reply)
+
+    def _run_batch(self, requests, reply):
+        results, writes = [], []
+        for request in requests:
+            if request.get('op') in READ_OPS:
+                results.extend(self._call_gui(writes))
+                writes = []
+                results.append(self._execute(request))
+            else:
+                writes.append(request)
+        results.extend(self._call_gui(writes))
+        reply(results)
+
+    def _call_gui(self, requests):
+        if not requests:
+            return []
+
+        future = Future()
+        self._calls.put((requests, future))
+        self._wakeup.emit()
+        try:
+            return future.result(CALL_TIMEOUT)
+        except TimeoutError:
+            if future.cancel():
+                return [{'error': 'timeout'}] * len(requests)
+            return future.result()
+        except CancelledError:
+            return [{'error': 'cancelled'}] * len(requests)
+
+    def _drain(self):
+        while True:
+            try:
+                requests, future = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            if future.set_running_or_notify_cancel():
+                future.set_result([self._execute(request) for request in requests])
+
+    def _execute(self, request):
+        handler = getattr(self, f'_op_{request.get("op")}', None)
+        if handler is None:
+            return {'error': f'unknown op {request.get("op")!r}'}
+        try:
+            return {'result': handler(request)}
+        except RegexError as error:
+            return {'error': str(error)}
+        except (KeyError, TypeError, ValueError) as error:
+            return {'error': f'bad request: {error}'}
+        except LookupError as error:
+            return {'error': str(error)}
+
+    def _op_search(self, request):
+        query = str(request.get('query', '')).strip()
+        limit = int(request.get('limit', SEARCH_LIMIT))
+        history, pinned = self.engine.full_history, self.engine.full_pinned_history
+
+        if query:
+            search = self.engine.prepare_search(query,
+                                                request.get('mode') or self.engine.search_mode)
+            history_texts, pinned_texts = search(None)
+
+        with self.engine.lock:
+            if not query:
+                return {'history': self._entries(history.entries(), limit),
+                        'pinned': self._entries(pinned.entries(), limit)}
+            return {'history': self._resolve(history, history_texts, limit),
+                    'pinned': self._resolve(pinned, pinned_texts, limit)}
+
+    def _op_get(self, request):
+        entry_id = int(request['entry'])
+        with self.engine.lock:
+            target, text, created_at = self._lookup(entry_id)
+        return {'entry': entry_id, 'text': text, 'target': target, 'created_at': created_at}
+
+    def _op_push(self, request):
+        text = str(request['text']).strip()
+        if not text:
+            raise ValueError('empty text')
+        self.history_service.add_to_history(text)
+        return self.engine.full_history.entry_id(text)
+
+    def _op_pin(self, request):
+        if 'entry' in request:
+            text = self._lookup(int(request['entry']))[1]
+        else:
+            text = str(request['text'])
+        self.history_service.pin_text(text)
+        return self.engine.full_pinned_history.entry_id(text)
+
+    def _lookup(self, entry_id):
+        entry = self.engine.get_entry(entry_id)
+        if entry is None:
+            raise LookupError(f'entry {entry_id} not found')
+        return entry
+
+    def _on_clip_added(self, entry_id, text):
+        self.server.publish({'event': 'clip', 'entry': entry_id, 'text': text})
+
+    @staticmethod
+    def _entries(entries, limit):
+        return [{'entry': entry_id, 'text': text}
+                for entry_id, text in itertools.islice(entries, limit)]
+
+    @staticmethod
+    def _resolve(buffer, texts, limit):
+        result = []
+        for text in texts[:limit]:
+            entry_id = buffer.entry_id(text)
+            if entry_id is not None:
+                result.append({'entry': entry_id, 'text': text})
+        return result
@@ -1,26 +1,38 @@
-import sys
+import functools, logging, sys
 from PyQt6.QtWidgets import QApplication
 from src.tray_manager import TrayManager
 from src.clipboard_manager import ClipboardManager
+from src.hotkey_dispatcher import HotkeyDispatcher
+from src.ipc_service import IpcService
 from src.settings_manager import SettingsManager
 from src.main_window import MainUI
 from src.settings_window import SettingsUI
+from src.startup_timer import StartupTimer
 from src.styles import get_theme_styles
 
+QUICK_PASTE_SLOTS = 9
+
 class ClipMateApp:
     def __init__(self):
+        self.startup_timer = StartupTimer()
         self.app = QApplication(sys.argv)
         self.settings = SettingsManager()
+        self.startup_timer.mark('config')
 
         saved_theme = self.settings.get('current_theme', 'light')
         self.apply_styles(saved_theme)
 
-        self.clipboard = ClipboardManager(self.settings)
+        self.clipboard = ClipboardManager(self.settings, self.app.clipboard())
+        self.ipc = IpcService(self.clipboard, self.settings.socket_file)
         self.main_ui = MainUI(self.settings, self.clipboard)
         self.settings_ui = SettingsUI(self.settings)
-        self.tray = TrayManager(self.settings)
+        self.startup_timer.mark('window')
+        self.hotkeys = HotkeyDispatcher()
+        self.tray = TrayManager(self.settings, self.hotkeys)
+        self.startup_timer.mark('time_to_tray')
 
         self.connect_signals()
+        self.update_quick_paste_hotkeys()
 
     def apply_styles(self, theme_name='light'):
         styles = get_theme_styles(theme_name)
@@ -39,13 +51,19 @@ class ClipMateApp:
                 self.settings_ui.resize(
                     self.settings_ui.size().width(), self.settings_ui.size().height()
                 )
+        elif key == 'quick_paste_hotkeys':
+            self.update_quick_paste_hotkeys()
+        elif key == 'ipc_server':
+            self.update_ipc_server()
 
     def connect_signals(self):
-        self.clipboard.history_updated.connect(self.main_ui.update_history_list)
-        self.clipboard.pinned_history_updated.connect(self.main_ui.update_pinned_history)
-        self.clipboard.images_updated.connect(self.main_ui.update_images_list)
+        self.clipboard.history_changed.connect(self.main_ui.apply_history_changes)
+        self.clipboard.pinned_history_changed.connect(self.main_ui.apply_pinned_changes)
+        self.clipboard.images_changed.connect(self.main_ui.apply_images_changes)
+        self.clipboard.history_service.loading_finished.connect(self.on_history_loaded)
 
         self.main_ui.paste_requested.connect(self.clipboard.paste_to_active_app)
+        self.main_ui.paste_many_requested.connect(self.clipboard.paste_many_to_active_app)
         self.main_ui.paste_image_requested.connect(self.clipboard.paste_image_to_active_app)
 
         self.main_ui.clear_history_requested.connect(
@@ -70,6 +88,28 @@ class ClipMateApp:
         self.main_ui.show_settings.connect(self.settings_ui.show)
         self.settings.settings_changed.connect(self.on_settings_changed)
 
+    def update_quick_paste_hotkeys(self):
+        enabled = self.settings.get('quick_paste_hotkeys', True)
+        for slot in range(1, QUICK_PASTE_SLOTS + 1):
+            if enabled:
+                self.hotkeys.bind(f'history_slot_{slot}', f'ctrl+alt+{slot}',
+                                  functools.partial(self.clipboard.paste_history_slot, slot))
+                self.hotkeys.bind(f'pinned_slot_{slot}', f'ctrl+alt+shift+{slot}',
+                                  functools.partial(self.clipboard.paste_pinned_slot, slot))
+            else:
+                self.hotkeys.unbind(f'history_slot_{slot}')
+                self.hotkeys.unbind(f'pinned_slot_{slot}')
+
+    def update_ipc_server(self):
+        if self.settings.get('ipc_server', True):
+            self.ipc.start()
+        else:
+            self.ipc.stop()
+
+    def on_history_loaded(self):
+        self.startup_timer.mark('time_to_full_history')
+        self.startup_timer.report()
+
     def show_main_window(self):
         self.main_ui.show()
         self.main_ui.raise_()
@@ -77,13 +117,20 @@ class ClipMateApp:
 
     def quit_app(self):
         self.tray.cleanup()
+        self.ipc.stop()
+        self.clipboard.history_service.flush()
+        self.settings.flush()
         self.app.quit()
 
     def run(self):
         self.main_ui.show()
+        self.startup_timer.mark('first_show')
+        self.clipboard.history_service.load_async()
+        self.update_ipc_server()
         return self.app.exec()
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     app = ClipMateApp()
     sys.exit(app.run())
\ No newline at end of file
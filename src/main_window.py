@@ -1,5 +1,5 @@
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit,
-                             QTabWidget, QInputDialog, QMessageBox)
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                             QTabWidget, QInputDialog, QMessageBox, QComboBox, QToolTip)
 from PyQt6.QtCore import pyqtSignal, QTimer, Qt
 
 from src.history_tab import HistoryTabWidget
@@ -11,6 +11,7 @@ from src.title_bar_styles import get_title_bar_styles
 
 class MainUI(QMainWindow):
     paste_requested = pyqtSignal(str)
+    paste_many_requested = pyqtSignal(list)
     paste_image_requested = pyqtSignal(str)
     show_settings = pyqtSignal()
     clear_history_requested = pyqtSignal()
@@ -32,7 +33,6 @@ class MainUI(QMainWindow):
         self.setup_ui()
         self.load_saved_tabs()
         self.restore_tabs_order()
-        self.show_initial_history()
 
         self.settings.settings_changed.connect(self.on_settings_changed)
         self.connect_tab_signals()
@@ -79,11 +79,28 @@ class MainUI(QMainWindow):
         history_label.setProperty('title', 'tab')
         content_layout.addWidget(history_label)
 
+        search_layout = QHBoxLayout()
+
         self.search_edit = QLineEdit()
         self.search_edit.textChanged.connect(
             lambda item: self.filter_text_changed.emit(self.search_edit.text())
         )
-        content_layout.addWidget(self.search_edit)
+        self.search_edit.textChanged.connect(lambda item: self.show_search_error(''))
+        self.clipboard.history_service.search_failed.connect(self.show_search_error)
+        search_layout.addWidget(self.search_edit)
+
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItem('Точный поиск', 'substring')
+        self.search_mode_combo.addItem('Нечёткий поиск', 'fuzzy')
+        index = self.search_mode_combo.findData(self.settings.get('search_mode', 'substring'))
+        if index >= 0:
+            self.search_mode_combo.setCurrentIndex(index)
+        self.search_mode_combo.currentIndexChanged.connect(
+            lambda index: self.settings.set('search_mode', self.search_mode_combo.itemData(index))
+        )
+        search_layout.addWidget(self.search_mode_combo)
+
+        content_layout.addLayout(search_layout)
 
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabsClosable(True)
@@ -98,13 +115,21 @@ class MainUI(QMainWindow):
 
         self.main_tab = HistoryTabWidget('main')
         self.main_tab.paste_requested.connect(self.paste_requested.emit)
+        self.main_tab.paste_many_requested.connect(self.paste_many_requested.emit)
 
-        self.images_tab = ImageTabWidget()
+        self.images_tab = ImageTabWidget(self.clipboard.history_service.get_image_thumbnail,
+                                         self.clipboard.history_service.is_near_duplicate,
+                                         self.clipboard.history_service.image_row)
         self.images_tab.paste_requested.connect(self.paste_image_requested.emit)
         self.images_tab.remove_requested.connect(self.remove_image_requested.emit)
+        self.images_tab.viewport_changed.connect(
+            self.clipboard.history_service.cancel_thumbnail_requests
+        )
+        self.clipboard.history_service.thumbnail_ready.connect(self.images_tab.on_thumbnail_ready)
 
         self.pin_tab = HistoryTabWidget('pin')
         self.pin_tab.paste_requested.connect(self.paste_requested.emit)
+        self.pin_tab.paste_many_requested.connect(self.paste_many_requested.emit)
 
         self.tab_widget_dict = {
             'Главная': self.main_tab,
@@ -155,12 +180,7 @@ class MainUI(QMainWindow):
             self.remove_from_pinned_requested.emit(text)
 
     def remove_from_history(self, text):
-        history = self.settings.get('history', [])
-        if text in history:
-            new_history = [item for item in history if item != text]
-            self.settings.set('history', new_history)
-            self.main_tab.update_history(new_history)
-            self.clipboard.history_updated.emit(new_history)
+        self.clipboard.remove_from_history(text)
 
     def clear_all_history(self):
         from PyQt6.QtWidgets import QMessageBox
@@ -279,7 +299,7 @@ class MainUI(QMainWindow):
             if isinstance(widget, EditableTabWidget):
                 existing_tabs.append(widget.get_tab_name())
 
-        for tab_name in self.settings.get('tabs_data', {}).keys():
+        for tab_name in self.settings.tabs.load_names():
             if tab_name not in existing_tabs and tab_name not in tabs_order:
                 editable_tab = EditableTabWidget(tab_name, self.settings)
                 editable_tab.paste_requested.connect(self.paste_requested.emit)
@@ -312,9 +332,6 @@ class MainUI(QMainWindow):
         self.tab_widget.setCurrentIndex(index)
         editable_tab.save_content()
 
-        data = self.settings.get('tabs_data', {}).copy()
-        self.settings.set('tabs_data', data)
-
         self.save_tabs_order()
 
     def rename_tab(self, index):
@@ -354,21 +371,12 @@ class MainUI(QMainWindow):
         self.tab_widget.removeTab(index)
 
         if isinstance(w, EditableTabWidget):
-            name = w.get_tab_name()
-            data = self.settings.get('tabs_data', {}).copy()
-            if name in data:
-                data.pop(name)
-                self.settings.set('tabs_data', data)
+            self.settings.tabs.remove(w.get_tab_name())
 
         self.save_tabs_order()
 
-    def show_initial_history(self):
-        self.main_tab.update_history(self.settings.get('history'))
-        self.pin_tab.update_history(self.settings.get('pinned_history'))
-        self.images_tab.update_images(self.settings.get('images'))
-
     def load_saved_tabs(self):
-        tabs_data = self.settings.get('tabs_data', {})
+        tab_names = self.settings.tabs.load_names()
 
         existing_tab_names = []
         for i in range(self.tab_widget.count()):
@@ -376,18 +384,29 @@ class MainUI(QMainWindow):
             if isinstance(widget, EditableTabWidget):
                 existing_tab_names.append(widget.get_tab_name())
 
-        for tab_name in list(tabs_data.keys()):
+        for tab_name in tab_names:
             if tab_name not in ['Главная', 'Изображения', 'Избранное']:
                 if tab_name not in existing_tab_names:
                     editable_tab = EditableTabWidget(tab_name, self.settings)
                     editable_tab.paste_requested.connect(self.paste_requested.emit)
                     self.tab_widget.addTab(editable_tab, tab_name)
 
-    def update_history_list(self, history):
-        self.main_tab.update_history(history)
+    def show_search_error(self, message):
+        if self.search_edit.toolTip() == message:
+            return
+        self.search_edit.setToolTip(message)
+        self.search_edit.setProperty('error', bool(message))
+        self.search_edit.style().unpolish(self.search_edit)
+        self.search_edit.style().polish(self.search_edit)
+        if message:
+            QToolTip.showText(self.search_edit.mapToGlobal(self.search_edit.rect().bottomLeft()),
+                              message, self.search_edit)
+
+    def apply_history_changes(self, changes):
+        self.main_tab.apply_changes(changes)
 
-    def update_pinned_history(self, pinned_history):
-        self.pin_tab.update_history(pinned_history)
+    def apply_pinned_changes(self, changes):
+        self.pin_tab.apply_changes(changes)
 
     def get_selected_text(self):
         current_tab = self.tab_widget.currentWidget()
@@ -395,15 +414,8 @@ class MainUI(QMainWindow):
         if isinstance(current_tab, EditableTabWidget):
             return current_tab.text_edit.toPlainText()
 
-        if hasattr(current_tab, 'tab_type'):
-            if current_tab.tab_type == 'main' and hasattr(current_tab, 'history_list'):
-                selected = current_tab.history_list.selectedItems()
-                if selected:
-                    return current_tab.get_item_text(selected[0])
-            elif current_tab.tab_type == 'pin' and hasattr(current_tab, 'pinned_history_list'):
-                selected = current_tab.pinned_history_list.selectedItems()
-                if selected:
-                    return current_tab.get_item_text(selected[0])
+        if isinstance(current_tab, HistoryTabWidget):
+            return current_tab.get_selected_text()
         return None
 
     def pin_selected_item(self):
@@ -426,5 +438,5 @@ class MainUI(QMainWindow):
     def requested_quit(self):
         self.quit_requested.emit()
 
-    def update_images_list(self, images):
-        self.images_tab.update_images(images)
\ No newline at end of file
+    def apply_images_changes(self, changes):
+        self.images_tab.apply_changes(changes)
\ No newline at end of file
@@ -0,0 +1,136 @@
+from PyQt6.QtWidgets import QApplication, QMainWindow
+
+WINDOW_TITLE = 'ClipMate'
+MODIFIER_KEYS = ('ctrl', 'alt', 'shift')
+
+
+class PasteBackend:
+    def visible_windows(self):
+        return []
+
+    def hide_windows(self, windows):
+        pass
+
+    def restore_windows(self, windows):
+        pass
+
+    def owns_focus(self):
+        return False
+
+    def modifiers_held(self):
+        return False
+
+    def target_ready(self, windows):
+        return True
+
+    def set_clipboard(self, mime_data):
+        raise NotImplementedError
+
+    def current_clipboard(self):
+        return None
+
+    def send_paste(self):
+        raise NotImplementedError
+
+    def send_key(self, key):
+        raise NotImplementedError
+
+
+class KeyboardPasteBackend(PasteBackend):
+    def __init__(self, clipboard=None):
+        self.clipboard = clipboard or QApplication.clipboard()
+
+    def visible_windows(self):
+        return [widget for widget in QApplication.topLevelWidgets()
+                if isinstance(widget, QMainWindow) and widget.windowTitle() == WINDOW_TITLE
+                and widget.isVisible() and not widget.isMinimized()]
+
+    def hide_windows(self, windows):
+        for widget in windows:
+            widget.showMinimized()
+
+    def restore_windows(self, windows):
+        for widget in windows:
+            widget.showNormal()
+        if windows:
+            windows[0].raise_()
+            windows[0].activateWindow()
+
+    def owns_focus(self):
+        return QApplication.activeWindow() is not None
+
+    def modifiers_held(self):
+        try:
+            import keyboard
+            return any(keyboard.is_pressed(key) for key in MODIFIER_KEYS)
+        except (ImportError, ValueError, OSError):
+            return False
+
+    def target_ready(self, windows):
+        if QApplication.activeWindow() is not None:
+            return False
+        return all(widget.isMinimized() or not widget.isVisible() for widget in windows)
+
+    def set_clipboard(self, mime_data):
+        self.clipboard.setMimeData(mime_data)
+
+    def current_clipboard(self):
+        return self.clipboard.mimeData()
+
+    def send_paste(self):
+        self.send_key('ctrl+v')
+
+    def send_key(self, key):
+        import keyboard
+        keyboard.send(key)
+
+
+
+class RecordingPasteBackend(PasteBackend):
+    def __init__(self, windows=(), ready_after=0, held_for=0, focused=False, consumes=True):
+        self.windows = list(windows)
+        self.ready_after = ready_after
+        self.held_for = held_for
+        self.focused = focused
+        self.consumes = consumes
+        self.calls = []
+        self.clipboard = None
+        self._ready_checks = 0
+
+    def visible_windows(self):
+        return list(self.windows)
+
+    def hide_windows(self, windows):
+        self.calls.append(('hide', len(windows)))
+        self._ready_checks = 0
+
+    def restore_windows(self, windows):
+        self.calls.append(('restore', len(windows)))
+
+    def owns_focus(self):
+        return self.focused
+
+    def modifiers_held(self):
+        if self.held_for > 0:
+            self.held_for -= 1
+            return True
+        return False
+
+    def target_ready(self, windows):
+        self._ready_checks += 1
+        return self._ready_checks > self.ready_after
+
+    def set_clipboard(self, mime_data):
+        self.clipboard = mime_data
+        self.calls.append(('clipboard', mime_data.text() if mime_data.hasText() else None))
+
+    def current_clipboard(self):
+        return self.clipboard
+
+    def send_paste(self):
+        self.calls.append(('send',))
+        if self.consumes and self.clipboard is not None:
+            self.clipboard.text()
+
+    def send_key(self, key):
+        self.calls.append(('key', key))
@@ -1,49 +1,246 @@
-import keyboard
-from PyQt6.QtWidgets import QApplication, QMainWindow
-from PyQt6.QtCore import QObject, QTimer
+import logging, time, uuid
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, QMimeData, pyqtSignal
+from src.paste_backends import KeyboardPasteBackend
 
-class PasteService(QObject):
+PASTE_MARKER_FORMAT = 'application/x-clipmate-paste'
+RESTORE_DELAY_MS = 300
+READY_POLL_MS = 5
+READY_TIMEOUT = 0.5
+MODIFIER_TIMEOUT = 3.0
+SETTLE_MS = 30
+CONSUMED_SETTLE_MS = 10
+ITEM_TIMEOUT_MS = 250
+SEPARATOR_KEYS = {'tab': 'tab', 'enter': 'enter'}
+
+logger = logging.getLogger('clipmate.paste')
+
+
+class PasteMimeData(QMimeData):
     def __init__(self):
         super().__init__()
+        self.on_consumed = None
+
+    def retrieveData(self, mime_type, preferred_type):
+        if self.on_consumed is not None and mime_type != PASTE_MARKER_FORMAT:
+            on_consumed, self.on_consumed = self.on_consumed, None
+            on_consumed()
+        return super().retrieveData(mime_type, preferred_type)
+
+
+class PasteService(QObject):
+    paste_finished = pyqtSignal(dict)
+
+    def __init__(self, settings_manager=None, backend=None):
+        super().__init__()
+        self.settings = settings_manager
+        self.backend = backend or KeyboardPasteBackend()
+        self.last_latency = {}
+
+        self._tokens = deque(maxlen=16)
+        self._requests = deque()
+        self._active = None
+
+        self._ready_timer = QTimer(self)
+        self._ready_timer.setInterval(READY_POLL_MS)
+        self._ready_timer.timeout.connect(self._check_ready)
+
+        self._item_timer = QTimer(self)
+        self._item_timer.setSingleShot(True)
+        self._item_timer.timeout.connect(self._send_next)
+
+        self._last_token = None
+        self._restore_snapshot = None
+        self._restore_timer = QTimer(self)
+        self._restore_timer.setSingleShot(True)
+        self._restore_timer.setInterval(RESTORE_DELAY_MS)
+        self._restore_timer.timeout.connect(self._restore_clipboard)
+
+    def is_own_change(self, mime_data):
+        if mime_data is None or not mime_data.hasFormat(PASTE_MARKER_FORMAT):
+            return False
+        return bytes(mime_data.data(PASTE_MARKER_FORMAT)) in self._tokens
 
     def paste_text(self, text):
         if not text or text.strip() == '':
             return
+        self._submit([text], hide_windows=True)
+
+    def paste_texts(self, texts):
+        texts = [text for text in texts if text and text.strip()]
+        if texts:
+            self._submit(texts, hide_windows=True)
+
+    def quick_paste_text(self, text, pressed_at=None):
+        if text and text.strip():
+            self._submit([text], hide_windows=False, requested_at=pressed_at)
+
+    def paste_image(self, image):
+        if image.isNull():
+            return
+        self._submit([image], hide_windows=True)
+
+    @staticmethod
+    def _prepare(item):
+        mime_data = PasteMimeData()
+        if isinstance(item, str):
+            mime_data.setText(item)
+        else:
+            mime_data.setImageData(item)
+        return mime_data
+
+    def _mark(self, mime_data):
+        token = uuid.uuid4().hex.encode()
+        self._tokens.append(token)
+        self._last_token = token
+        mime_data.setData(PASTE_MARKER_FORMAT, token)
+        return mime_data
+
+    def _snapshot_clipboard(self):
+        pending, self._restore_snapshot = self._restore_snapshot, None
+        self._restore_timer.stop()
+        if not (self.settings and self.settings.get('restore_clipboard_after_paste', False)):
+            return None
+        if pending is not None and self._holds_last_paste():
+            return pending
+
+        source = self.backend.current_clipboard()
+        if source is None:
+            return None
+        snapshot = QMimeData()
+        if source.hasImage():
+            snapshot.setImageData(source.imageData())
+        for mime_format in source.formats():
+            if mime_format != PASTE_MARKER_FORMAT:
+                snapshot.setData(mime_format, source.data(mime_format))
+        return snapshot
 
-        self._minimize_windows()
-        QTimer.singleShot(100, lambda: self._do_paste_text(text))
+    def _submit(self, items, hide_windows, requested_at=None):
+        self._requests.append((items, hide_windows, requested_at or time.perf_counter()))
+        if self._active is None:
+            self._start_next()
 
-    def paste_image(self, pixmap):
-        if pixmap.isNull():
+    def _start_next(self):
+        if not self._requests:
+            self._active = None
             return
 
-        self._minimize_windows()
-        QTimer.singleShot(100, lambda: self._do_paste_image(pixmap))
-
-    def _do_paste_text(self, text):
-        clipboard = QApplication.clipboard()
-        clipboard.setText(text)
-        keyboard.send('ctrl+v')
-        self._show_windows()
-
-    def _do_paste_image(self, pixmap):
-        clipboard = QApplication.clipboard()
-        clipboard.setPixmap(pixmap)
-        keyboard.send('ctrl+v')
-        self._show_windows()
-
-    def _minimize_windows(self):
-        for widget in QApplication.topLevelWidgets():
-            if isinstance(widget, QMainWindow) and widget.windowTitle() == 'ClipMate':
-                widget.showMinimized()
-
-    def _show_windows(self):
-        QTimer.singleShot(50, lambda: self._restore_windows())
-
-    def _restore_windows(self):
-        for widget in QApplication.topLevelWidgets():
-            if isinstance(widget, QMainWindow) and widget.windowTitle() == 'ClipMate':
-                widget.showNormal()
-                widget.raise_()
-                widget.activateWindow()
-                break
\ No newline at end of file
+        items, hide_windows, requested_at = self._requests.popleft()
+        if hide_windows or self.backend.owns_focus():
+            windows = self.backend.visible_windows()
+        else:
+            windows = []
+        self._active = {
+            'items': items,
+            'position': 0,
+            'prepared': self._prepare(items[0]),
+            'snapshot': self._snapshot_clipboard(),
+            'windows': windows,
+            'stages': {'requested': requested_at},
+        }
+
+        self.backend.hide_windows(windows)
+        self._mark_stage('hidden')
+        self._check_ready()
+        if self._active is not None and 'ready' not in self._active['stages']:
+            self._ready_timer.start()
+
+    def _check_ready(self):
+        request = self._active
+        if request is None:
+            self._ready_timer.stop()
+            return
+
+        stages = request['stages']
+        if 'released' not in stages:
+            if self.backend.modifiers_held():
+                if time.perf_counter() - stages['hidden'] > MODIFIER_TIMEOUT:
+                    self._ready_timer.stop()
+                    self._abandon(request)
+                return
+            self._mark_stage('released')
+
+        timed_out = time.perf_counter() - stages['released'] > READY_TIMEOUT
+        if not self.backend.target_ready(request['windows']) and not timed_out:
+            return
+
+        self._ready_timer.stop()
+        self._mark_stage('ready')
+        self._send(request)
+
+    def _send(self, request):
+        position = request['position']
+        prepared = self._mark(request['prepared'])
+        self.backend.set_clipboard(prepared)
+
+        if position < len(request['items']) - 1:
+            request['consuming'] = prepared
+            prepared.on_consumed = self._on_item_consumed
+            self._item_timer.start(ITEM_TIMEOUT_MS)
+            self.backend.send_paste()
+            self._mark_stage(f'sent_{position + 1}')
+            request['position'] = position + 1
+            request['prepared'] = self._prepare(request['items'][position + 1])
+            return
+
+        self.backend.send_paste()
+        self._mark_stage('sent')
+
+        if request['snapshot'] is not None:
+            self._restore_snapshot = request['snapshot']
+            self._restore_timer.start()
+
+        if request['windows']:
+            QTimer.singleShot(SETTLE_MS, self._finish)
+        else:
+            self._finish()
+
+    def _abandon(self, request):
+        logger.warning('paste abandoned: modifier keys still held')
+        if request['snapshot'] is not None:
+            self._restore_snapshot = request['snapshot']
+            self._restore_timer.start()
+        self._finish()
+
+    def _holds_last_paste(self):
+        mime_data = self.backend.current_clipboard()
+        if mime_data is None or not mime_data.hasFormat(PASTE_MARKER_FORMAT):
+            return False
+        return bytes(mime_data.data(PASTE_MARKER_FORMAT)) == self._last_token
+
+    def _restore_clipboard(self):
+        snapshot, self._restore_snapshot = self._restore_snapshot, None
+        if snapshot is not None and self._holds_last_paste():
+            self.backend.set_clipboard(self._mark(snapshot))
+
+    def _on_item_consumed(self):
+        if self._item_timer.isActive():
+            self._item_timer.start(CONSUMED_SETTLE_MS)
+
+    def _send_next(self):
+        request = self._active
+        request.pop('consuming').on_consumed = None
+        separator = self.settings.get('paste_queue_separator', 'tab') if self.settings else 'tab'
+        separator = SEPARATOR_KEYS.get(separator)
+        if separator:
+            self.backend.send_key(separator)
+        self._send(request)
+
+    def _finish(self):
+        request = self._active
+        self.backend.restore_windows(request['windows'])
+        self._mark_stage('restored')
+
+        stages = request['stages']
+        started = stages['requested']
+        self.last_latency = {name: (moment - started) * 1000 for name, moment in stages.items()}
+        logger.info('paste: %s', ', '.join(f'{name} {elapsed:.1f} ms'
+                                           for name, elapsed in self.last_latency.items()
+                                           if name != 'requested'))
+        self.paste_finished.emit(self.last_latency)
+
+        self._active = None
+        self._start_next()
+
+    def _mark_stage(self, name):
+        self._active['stages'][name] = time.perf_counter()
@@ -0,0 +1,39 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HASH_SIZE = 8
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    if image is None or image.isNull():
+        return None
+
+    width, height = hash_size + 1, hash_size
+    small = image.scaled(width, height,
+                         Qt.AspectRatioMode.IgnoreAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation)
+    small = small.convertToFormat(QImage.Format.Format_Grayscale8)
+    stride = small.bytesPerLine()
+
+    bits = small.constBits()
+    bits.setsize(small.sizeInBytes())
+
+    if np is not None:
+        pixels = np.frombuffer(bits, dtype=np.uint8).reshape(height, stride)[:, :width]
+        gradient = pixels[:, 1:] > pixels[:, :-1]
+        value = int.from_bytes(np.packbits(gradient.ravel()).tobytes(), 'big')
+    else:
+        data = bytes(bits)
+        value = 0
+        for y in range(height):
+            row = data[y * stride:y * stride + width]
+            for x in range(hash_size):
+                value = (value << 1) | (row[x + 1] > row[x])
+
+    return f'{value:0{hash_size * hash_size // 4}x}'
+
@@ -0,0 +1,76 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from src.core.cancellation import SearchCancelled
+from src.core.regex_worker import RegexError
+
+
+class SearchJob(QRunnable):
+    def __init__(self, pipeline, generation, prepare):
+        super().__init__()
+        self.pipeline = pipeline
+        self.generation = generation
+        self.prepare = prepare
+
+    def is_cancelled(self):
+        return self.generation != self.pipeline.generation
+
+    def run(self):
+        if self.is_cancelled():
+            return
+        try:
+            result = self.prepare()(self.is_cancelled)
+        except SearchCancelled:
+            return
+        except RegexError as error:
+            result = error
+        except Exception:
+            result = None
+        if not self.is_cancelled():
+            self.pipeline.job_finished.emit(self.generation, result)
+
+
+class SearchPipeline(QObject):
+    job_finished = pyqtSignal(int, object)
+    results_ready = pyqtSignal(int, object)
+    search_failed = pyqtSignal(str)
+
+    def __init__(self, debounce_ms=120):
+        super().__init__()
+        self.generation = 0
+        self._prepare = None
+
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(1)
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._start_job)
+
+        self.job_finished.connect(self._on_job_finished)
+
+    def submit(self, prepare):
+        self.generation += 1
+        self._prepare = prepare
+        self._timer.start()
+        return self.generation
+
+    def cancel(self):
+        self.generation += 1
+        self._prepare = None
+        self._timer.stop()
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _start_job(self):
+        prepare, self._prepare = self._prepare, None
+        if prepare is not None:
+            self._pool.start(SearchJob(self, self.generation, prepare))
+
+    def _on_job_finished(self, generation, result):
+        if generation != self.generation or result is None:
+            return
+        if isinstance(result, RegexError):
+            self.search_failed.emit(str(result))
+        else:
+            self.results_ready.emit(generation, result)
@@ -1,49 +1,31 @@
-import json, os
 from PyQt6.QtCore import QObject, pyqtSignal
+from src.core.settings import Settings
+from src.image_fingerprint import data_fingerprint
 
 class SettingsManager(QObject):
     settings_changed = pyqtSignal(str, object)
 
-    def __init__(self):
+    def __init__(self, data_dir='../data'):
         super().__init__()
-        self.setting_file = '../data/clipmate_settings.json'
-        self.settings = self.load_settings()
+        self.core = Settings(data_dir, data_fingerprint)
+        self.core.changed.connect(self.settings_changed.emit)
 
-    def load_settings(self):
-        default_settings = {
-            'max_history_size': 10,
-            'max_images_size': 10,
-            'history': [],
-            'pinned_history': [],
-            'images': [],
-            'global_hotkey': 'Ctrl+Shift+H',
-            'tabs_data': {},
-            'tabs_order': ['Главная', 'Изображения', 'Избранное'],
-            'current_theme': 'light'
-        }
-
-        if os.path.exists(self.setting_file):
-            try:
-                with open(self.setting_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
-                    default_settings.update(loaded_settings)
-            except Exception:
-                pass
-
-        return default_settings
+        self.journal_file = self.core.journal_file
+        self.thumbnail_dir = self.core.thumbnail_dir
+        self.socket_file = self.core.socket_file
+        self.blob_store = self.core.blob_store
+        self.store = self.core.store
+        self.tabs = self.core.tabs
+        self.settings = self.core.settings
 
     def save_settings(self):
-        try:
-            with open(self.setting_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
+        self.core.save_settings()
+
+    def flush(self):
+        self.core.flush()
 
     def get(self, key, default=None):
-        return self.settings.get(key, default)
+        return self.core.get(key, default)
 
     def set(self, key, value):
-        if self.settings.get(key) != value:
-            self.settings[key] = value
-            self.settings_changed.emit(key, value)
-            self.save_settings()
\ No newline at end of file
+        self.core.set(key, value)
@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QSpinBox, QFormLayout, QLineEdit, QPushButton, QGroupBox,
-                             QComboBox)
+                             QComboBox, QCheckBox)
 from PyQt6.QtCore import Qt
+from src.core.settings import MEGABYTE
+from src.core.ipc_server import IpcServer
 from src.styles import AVAILABLE_THEMES
 from src.custom_title_bar import CustomTitleBar
 from src.title_bar_styles import get_title_bar_styles
@@ -54,19 +56,80 @@ class SettingsUI(QMainWindow):
         )
         text_layout.addRow('Максимальный размер истории:', self.history_size)
 
+        self.restore_clipboard = QCheckBox('Восстанавливать буфер обмена после вставки')
+        self.restore_clipboard.setChecked(self.settings.get('restore_clipboard_after_paste', False))
+        self.restore_clipboard.toggled.connect(
+            lambda checked: self.settings.set('restore_clipboard_after_paste', checked)
+        )
+        text_layout.addRow(self.restore_clipboard)
+
+        self.separator_combo = QComboBox()
+        self.separator_combo.addItem('Tab', 'tab')
+        self.separator_combo.addItem('Enter', 'enter')
+        self.separator_combo.addItem('Без разделителя', 'none')
+        index = self.separator_combo.findData(self.settings.get('paste_queue_separator', 'tab'))
+        if index >= 0:
+            self.separator_combo.setCurrentIndex(index)
+        self.separator_combo.currentIndexChanged.connect(
+            lambda index: self.settings.set('paste_queue_separator',
+                                            self.separator_combo.itemData(index))
+        )
+        text_layout.addRow('Между вставками:', self.separator_combo)
+
         image_group = QGroupBox('Настройки изображений')
         image_layout = QFormLayout(image_group)
 
-        self.image_size = QSpinBox()
-        self.image_size.setRange(1, 20)
-        self.image_size.setValue(self.settings.get('max_images_size', 10))
-        self.image_size.valueChanged.connect(
-            lambda value: self.settings.set('max_images_size', value)
+        self.image_bytes = QSpinBox()
+        self.image_bytes.setRange(1, 50)
+        self.image_bytes.setSuffix(' МБ')
+        self.image_bytes.setValue(self.settings.get('max_image_bytes', 4 * MEGABYTE) // MEGABYTE)
+        self.image_bytes.valueChanged.connect(
+            lambda value: self.settings.set('max_image_bytes', value * MEGABYTE)
+        )
+        image_layout.addRow('Размер одного изображения:', self.image_bytes)
+
+        self.images_bytes = QSpinBox()
+        self.images_bytes.setRange(8, 4096)
+        self.images_bytes.setSuffix(' МБ')
+        self.images_bytes.setValue(
+            self.settings.get('max_images_bytes', 128 * MEGABYTE) // MEGABYTE
+        )
+        self.images_bytes.valueChanged.connect(
+            lambda value: self.settings.set('max_images_bytes', value * MEGABYTE)
+        )
+        image_layout.addRow('Всего под изображения:', self.images_bytes)
+
+        self.keep_original = QCheckBox('Сохранять оригинал без сжатия')
+        self.keep_original.setChecked(self.settings.get('image_keep_original', False))
+        self.keep_original.toggled.connect(
+            lambda checked: self.settings.set('image_keep_original', checked)
         )
-        image_layout.addRow('Максимум изображений:', self.image_size)
+        image_layout.addRow(self.keep_original)
+
+        self.dedup_mode_combo = QComboBox()
+        self.dedup_mode_combo.addItem('Заменять предыдущее', 'collapse')
+        self.dedup_mode_combo.addItem('Отмечать', 'flag')
+        self.dedup_mode_combo.addItem('Выключено', 'off')
+        index = self.dedup_mode_combo.findData(self.settings.get('image_dedup_mode', 'collapse'))
+        if index >= 0:
+            self.dedup_mode_combo.setCurrentIndex(index)
+        self.dedup_mode_combo.currentIndexChanged.connect(
+            lambda index: self.settings.set('image_dedup_mode',
+                                            self.dedup_mode_combo.itemData(index))
+        )
+        image_layout.addRow('Похожие изображения:', self.dedup_mode_combo)
+
+        self.dedup_threshold = QSpinBox()
+        self.dedup_threshold.setRange(0, 16)
+        self.dedup_threshold.setValue(self.settings.get('image_dedup_threshold', 3))
+        self.dedup_threshold.valueChanged.connect(
+            lambda value: self.settings.set('image_dedup_threshold', value)
+        )
+        image_layout.addRow('Порог сходства (бит):', self.dedup_threshold)
 
         hotkey_group = QGroupBox('Горячие клавиши')
-        hotkey_layout = QHBoxLayout(hotkey_group)
+        hotkey_group_layout = QVBoxLayout(hotkey_group)
+        hotkey_layout = QHBoxLayout()
         self.hotkey_edit = QLineEdit()
         self.hotkey_edit.setText(self.settings.get('global_hotkey'))
 
@@ -76,6 +139,24 @@ class SettingsUI(QMainWindow):
         hotkey_layout.addWidget(QLabel('Горячая клавиша:'))
         hotkey_layout.addWidget(self.hotkey_edit)
         hotkey_layout.addWidget(hotkey_btn)
+        hotkey_group_layout.addLayout(hotkey_layout)
+
+        self.quick_paste = QCheckBox(
+            'Быстрая вставка: Ctrl+Alt+1..9, избранное Ctrl+Alt+Shift+1..9'
+        )
+        self.quick_paste.setChecked(self.settings.get('quick_paste_hotkeys', True))
+        self.quick_paste.toggled.connect(
+            lambda checked: self.settings.set('quick_paste_hotkeys', checked)
+        )
+        hotkey_group_layout.addWidget(self.quick_paste)
+
+        self.ipc_server = QCheckBox('Локальный API через Unix-сокет')
+        self.ipc_server.setChecked(self.settings.get('ipc_server', True))
+        self.ipc_server.setVisible(IpcServer.is_supported())
+        self.ipc_server.toggled.connect(
+            lambda checked: self.settings.set('ipc_server', checked)
+        )
+        hotkey_group_layout.addWidget(self.ipc_server)
 
         theme_group = QGroupBox('Настройки темы')
         theme_layout = QFormLayout(theme_group)
@@ -0,0 +1,24 @@
+import logging, time
+
+logger = logging.getLogger('clipmate.startup')
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, (time.perf_counter() - self.started_at) * 1000))
+
+    def elapsed(self, name):
+        for mark_name, elapsed in self.marks:
+            if mark_name == name:
+                return elapsed
+        return None
+
+    def report(self):
+        lines = [f'  {name:<20} {elapsed:9.1f} ms' for name, elapsed in self.marks]
+        text = 'ClipMate startup timings:\n' + '\n'.join(lines)
+        logger.info(text)
+        return text
@@ -112,7 +112,7 @@ def get_theme_styles(theme_name="light"):
             background: {theme["accent"]}20;
         }}
 
-        QListWidget {{
+        QListView {{
             background: {theme["secondary_background"]};
             border: 1px solid {theme["border"]};
             border-radius: 4px;
@@ -120,12 +120,12 @@ def get_theme_styles(theme_name="light"):
             font-size: 12px;
         }}
 
-        QListWidget::item {{
+        QListView::item {{
             padding: 6px;
             border-bottom: 1px solid {theme["border"]}40;
         }}
 
-        QListWidget::item:selected {{
+        QListView::item:selected {{
             background: {theme["accent"]};
             color: white;
         }}
@@ -153,6 +153,11 @@ def get_theme_styles(theme_name="light"):
             padding: 5px;
         }}
 
+        QLineEdit[error="true"] {{
+            border: 2px solid {theme["error"]};
+            padding: 5px;
+        }}
+
         QLabel {{
             color: {theme["text"]};
             font-size: 12px;
@@ -0,0 +1,153 @@
+import os, tempfile, threading
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+THUMBNAIL_SIZE = 100
+
+
+def make_thumbnail(image):
+    if image.isNull():
+        return image
+    return image.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE,
+                        Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation)
+
+
+class ThumbnailCache:
+    def __init__(self, directory, capacity=256):
+        self.directory = directory
+        self.capacity = capacity
+        self._pixmaps = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, image_id):
+        return os.path.join(self.directory, f'{image_id}.png')
+
+    def contains(self, image_id):
+        return image_id in self._pixmaps or os.path.exists(self.path(image_id))
+
+    def store(self, image_id, thumbnail):
+        if thumbnail.isNull():
+            return False
+
+        fd, temp_path = tempfile.mkstemp(prefix='.thumb_', suffix='.png', dir=self.directory)
+        os.close(fd)
+        try:
+            if not thumbnail.save(temp_path, 'PNG'):
+                os.remove(temp_path)
+                return False
+            os.replace(temp_path, self.path(image_id))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def load_image(self, image_id):
+        return QImage(self.path(image_id))
+
+    def put(self, image_id, pixmap):
+        self._pixmaps[image_id] = pixmap
+        self._pixmaps.move_to_end(image_id)
+        while len(self._pixmaps) > self.capacity:
+            self._pixmaps.popitem(last=False)
+
+    def peek(self, image_id):
+        pixmap = self._pixmaps.get(image_id)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(image_id)
+        return pixmap
+
+    def remove(self, image_id):
+        self._pixmaps.pop(image_id, None)
+        try:
+            os.remove(self.path(image_id))
+        except OSError:
+            pass
+
+    def clear(self):
+        self._pixmaps.clear()
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class ThumbnailJob(QRunnable):
+    def __init__(self, loader, image_id):
+        super().__init__()
+        self.loader = loader
+        self.image_id = image_id
+
+    def run(self):
+        if not self.loader.is_pending(self.image_id):
+            return
+
+        cache = self.loader.cache
+        image = cache.load_image(self.image_id)
+        if image.isNull():
+            image = make_thumbnail(QImage(self.loader.blob_store.path(self.image_id)))
+            if not image.isNull():
+                cache.store(self.image_id, image)
+        self.loader.thumbnail_loaded.emit(self.image_id, image)
+
+
+class ThumbnailLoader(QObject):
+    thumbnail_loaded = pyqtSignal(str, object)
+    thumbnail_ready = pyqtSignal(str)
+
+    def __init__(self, cache, blob_store, max_workers=2):
+        super().__init__()
+        self.cache = cache
+        self.blob_store = blob_store
+
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_workers)
+
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._failed = set()
+        self._priority = 0
+
+        self.thumbnail_loaded.connect(self._on_thumbnail_loaded)
+
+    def is_pending(self, image_id):
+        with self._lock:
+            return image_id in self._pending
+
+    def request(self, image_id):
+        with self._lock:
+            if image_id in self._pending or image_id in self._failed:
+                return
+            self._pending.add(image_id)
+
+        self._priority += 1
+        self._pool.start(ThumbnailJob(self, image_id), self._priority)
+
+    def cancel_pending(self):
+        self._pool.clear()
+        with self._lock:
+            self._pending.clear()
+        self._priority = 0
+
+    def forget(self, image_id):
+        with self._lock:
+            self._pending.discard(image_id)
+            self._failed.discard(image_id)
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _on_thumbnail_loaded(self, image_id, image):
+        with self._lock:
+            self._pending.discard(image_id)
+            if image.isNull():
+                self._failed.add(image_id)
+                return
+
+        self.cache.put(image_id, QPixmap.fromImage(image))
+        self.thumbnail_ready.emit(image_id)
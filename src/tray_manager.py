@@ -1,4 +1,3 @@
-import threading, keyboard
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtCore import QObject, pyqtSignal, Qt
@@ -9,9 +8,10 @@ class TrayManager(QObject):
     show_settings = pyqtSignal()
     quit_app = pyqtSignal()
 
-    def __init__(self, settings_manager):
+    def __init__(self, settings_manager, hotkeys):
         super().__init__()
         self.settings = settings_manager
+        self.hotkeys = hotkeys
         self.setup_tray()
         self.update_hotkey()
 
@@ -43,26 +43,14 @@ class TrayManager(QObject):
             self.show_main.emit()
 
     def update_hotkey(self):
-        def start_listener():
-            hotkey_sequence = self.settings.get('global_hotkey', 'ctrl+shift+h')
-
-            if hasattr(self, 'current_hotkey'):
-                keyboard.remove_hotkey(self.current_hotkey)
-
-            self.current_hotkey = keyboard.add_hotkey(
-                hotkey_sequence,
-                lambda: self.show_main.emit()
-            )
-
-            keyboard.wait()
-
-        hotkey_thread = threading.Thread(target=start_listener, daemon=True)
-        hotkey_thread.start()
+        hotkey_sequence = self.settings.get('global_hotkey', 'ctrl+shift+h')
+        if hotkey_sequence != self.hotkeys.sequence('show_main'):
+            self.hotkeys.bind('show_main', hotkey_sequence,
+                              lambda pressed_at: self.show_main.emit())
 
     def on_settings_changed(self, key):
         if key == 'global_hotkey':
             self.update_hotkey()
 
     def cleanup(self):
-        if hasattr(self, 'current_hotkey'):
-            keyboard.remove_hotkey(self.current_hotkey)
\ No newline at end of file
+        self.hotkeys.clear()
@@ -0,0 +1,10 @@
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,122 @@
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from src.paste_backends import RecordingPasteBackend
+from src.paste_service import ITEM_TIMEOUT_MS, PasteService
+
+TIMEOUT_MS = 2000
+
+
+def run_until_finished(service, count=1):
+    finished = []
+    loop = QEventLoop()
+
+    def on_finished(latency):
+        finished.append(latency)
+        if len(finished) == count:
+            loop.quit()
+
+    service.paste_finished.connect(on_finished)
+    QTimer.singleShot(TIMEOUT_MS, loop.quit)
+    loop.exec()
+    service.paste_finished.disconnect(on_finished)
+    assert len(finished) == count
+    return finished
+
+
+def test_paste_hides_waits_sends_and_restores_in_order(qapp):
+    backend = RecordingPasteBackend(windows=['main'], ready_after=3)
+    service = PasteService(backend=backend)
+
+    service.paste_text('hello')
+    assert backend.calls == [('hide', 1)]
+
+    run_until_finished(service)
+    assert backend.calls == [('hide', 1), ('clipboard', 'hello'), ('send',), ('restore', 1)]
+
+
+def test_queued_requests_run_one_after_another(qapp):
+    backend = RecordingPasteBackend(windows=['main'], ready_after=2)
+    service = PasteService(backend=backend)
+
+    service.paste_text('first')
+    service.paste_text('second')
+    run_until_finished(service, count=2)
+
+    assert backend.calls == [
+        ('hide', 1), ('clipboard', 'first'), ('send',), ('restore', 1),
+        ('hide', 1), ('clipboard', 'second'), ('send',), ('restore', 1),
+    ]
+
+
+def test_multiple_items_are_separated_by_the_configured_key(qapp):
+    backend = RecordingPasteBackend()
+    service = PasteService(backend=backend)
+
+    service.paste_texts(['a', '', 'b'])
+    latency, = run_until_finished(service)
+
+    assert backend.calls == [
+        ('hide', 0), ('clipboard', 'a'), ('send',),
+        ('key', 'tab'), ('clipboard', 'b'), ('send',), ('restore', 0),
+    ]
+    assert 'sent_1' in latency
+
+
+def test_next_item_waits_for_the_target_to_read_the_clipboard(qapp):
+    backend = RecordingPasteBackend()
+    service = PasteService(backend=backend)
+
+    service.paste_texts(['a', 'b'])
+    latency, = run_until_finished(service)
+
+    assert latency['sent'] - latency['sent_1'] < ITEM_TIMEOUT_MS
+
+
+def test_next_item_falls_back_to_a_timeout_when_nothing_reads(qapp):
+    backend = RecordingPasteBackend(consumes=False)
+    service = PasteService(backend=backend)
+
+    service.paste_texts(['a', 'b'])
+    latency, = run_until_finished(service)
+
+    assert ('clipboard', 'b') in backend.calls
+    assert latency['sent'] - latency['sent_1'] >= ITEM_TIMEOUT_MS * 0.9
+
+
+def test_last_latency_records_every_stage_from_the_request(qapp):
+    backend = RecordingPasteBackend(windows=['main'], ready_after=1)
+    service = PasteService(backend=backend)
+
+    service.paste_text('hello')
+    latency, = run_until_finished(service)
+
+    assert list(latency) == ['requested', 'hidden', 'released', 'ready', 'sent', 'restored']
+    assert latency == service.last_latency
+    assert latency['requested'] == 0
+    assert all(elapsed >= 0 for elapsed in latency.values())
+    assert latency['hidden'] <= latency['ready'] <= latency['sent'] <= latency['restored']
+
+
+def test_quick_paste_keeps_windows_when_another_app_is_focused(qapp):
+    backend = RecordingPasteBackend(windows=['main'], held_for=2)
+    service = PasteService(backend=backend)
+
+    service.quick_paste_text('hello')
+    run_until_finished(service)
+
+    assert backend.calls == [('hide', 0), ('clipboard', 'hello'), ('send',), ('restore', 0)]
+    assert backend.held_for == 0
+
+
+def test_quick_paste_hides_own_windows_when_they_have_focus(qapp):
+    backend = RecordingPasteBackend(windows=['main'], focused=True)
+    service = PasteService(backend=backend)
+
+    service.quick_paste_text('hello')
+    run_until_finished(service)
+
+    assert backend.calls[0] == ('hide', 1)
+    assert backend.calls[-1] == ('restore', 1)